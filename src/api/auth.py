@@ -13,6 +13,7 @@ from src.exceptions import (
 )
 from src.services.auth import AuthService
 from src.schemas.users import UserLogin, UserRequestAdd
+from src.utils.cache import key_builder_by_params, private_cache
 
 router = APIRouter(prefix="/auth", tags=["Авторизация и аутентификация"])
 
@@ -45,6 +46,7 @@ async def login_user(data: UserLogin, response: Response, request: Request, db:
 
 
 @router.get("/me", summary="Мой профиль 🤵‍")
+@private_cache(expire=30, key_builder=key_builder_by_params("user_id"))
 async def get_me(user_id: UserIdDep, db: DBDep):
     return await AuthService(db).get_one_or_none_user(user_id)
 
@@ -14,6 +14,25 @@ from src.services.bookings import BookingService
 
 router = APIRouter(prefix="/bookings", tags=["Бронирования"])
 
+BOOKING_OPENAPI_EXAMPLES = {
+    "1": {
+        "summary": "Бронирование 1",
+        "value": {
+            "room_id": 1,
+            "date_from": date.today(),
+            "date_to": date.today(),
+        },
+    },
+    "2": {
+        "summary": "Бронирование 2",
+        "value": {
+            "room_id": 2,
+            "date_from": "2026-10-27",
+            "date_to": "2026-11-02",
+        },
+    },
+}
+
 
 @router.get("", summary="Получение всех бронирований")
 async def get_bookings(db: DBDep):
@@ -32,26 +51,7 @@ async def get_user_bookings(user_id: UserIdDep, db: DBDep):
 async def create_booking(
     user_id: UserIdDep,
     db: DBDep,
-    booking_data: BookingAddRequest = Body(
-        openapi_examples={
-            "1": {
-                "summary": "Бронирование 1",
-                "value": {
-                    "room_id": 1,
-                    "date_from": date.today(),
-                    "date_to": date.today(),
-                },
-            },
-            "2": {
-                "summary": "Бронирование 2",
-                "value": {
-                    "room_id": 2,
-                    "date_from": "2026-10-27",
-                    "date_to": "2026-11-02",
-                },
-            },
-        }
-    ),
+    booking_data: BookingAddRequest = Body(openapi_examples=BOOKING_OPENAPI_EXAMPLES),
 ):
     try:
         booking = await BookingService(db).create_booking(user_id, booking_data)
@@ -1,21 +1,52 @@
+from datetime import date
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, Query, Request
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 from src.database import async_session_maker
-from src.services.auth import AuthService
+from src.exceptions import check_date_to_after_date_from
+from src.services.auth import auth_service
 from src.utils.db_manager import DBManager
 
 
 class PaginationParams(BaseModel):
     page: Annotated[int | None, Query(1, ge=1)]
     per_page: Annotated[int | None, Query(None, ge=1, lt=30)]
+    last_id: Annotated[
+        int | None,
+        Query(None, ge=1, description="id последнего объекта предыдущей страницы"),
+    ]
 
 
 PaginationDep = Annotated[PaginationParams, Depends()]
 
 
+class KeysetPaginationParams(BaseModel):
+    per_page: Annotated[int | None, Query(None, ge=1, lt=30)]
+    last_id: Annotated[
+        int | None,
+        Query(None, ge=1, description="id последнего объекта предыдущей страницы"),
+    ]
+
+
+KeysetPaginationDep = Annotated[KeysetPaginationParams, Depends()]
+
+
+class DateRangeParams(BaseModel):
+    date_from: Annotated[date, Query(example="2025-08-01")]
+    date_to: Annotated[date, Query(example="2025-08-07")]
+
+    # Проверка выполняется при разрешении зависимостей, до сессии БД и кэша
+    @model_validator(mode="after")
+    def check_date_range(self):
+        check_date_to_after_date_from(self.date_from, self.date_to)
+        return self
+
+
+DateRangeDep = Annotated[DateRangeParams, Depends()]
+
+
 def get_token(request: Request) -> str:
     token = request.cookies.get("access_token", None)
     if not token:
@@ -24,7 +55,7 @@ def get_token(request: Request) -> str:
 
 
 def get_current_user_id(token: str = Depends(get_token)) -> int:
-    data = AuthService().decode_token(token)
+    data = auth_service.decode_token(token)
     user_id = data.get("user_id", None)
     if not user_id:
         raise HTTPException(status_code=401, detail="Ошибка получения id пользователя")
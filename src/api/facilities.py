@@ -6,12 +6,13 @@ from src.api.dependencies import DBDep
 from src.exceptions import ObjectAlreadyExistsHTTPException, ObjectAlreadyExistsException
 from src.schemas.facilities import FacilityAdd
 from src.services.facilities import FacilityService
+from src.utils.cache import RawJsonCoder
 
 router = APIRouter(prefix="/facilities", tags=["Удобства"])
 
 
 @router.get("", summary="Получить список всех удобств")
-@cache(expire=15)
+@cache(expire=15, coder=RawJsonCoder)
 async def get_facilities(db: DBDep):
     return await FacilityService(db).get_facilities()
 
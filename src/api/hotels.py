@@ -1,10 +1,8 @@
-from datetime import date
-
 from fastapi import Query, APIRouter, Body, HTTPException
 
 from fastapi_cache.decorator import cache
 
-from src.api.dependencies import PaginationDep, DBDep
+from src.api.dependencies import PaginationDep, DateRangeDep, DBDep
 from src.exceptions import (
     ObjectNotFoundException,
     HotelNotFoundHTTPException,
@@ -15,12 +13,35 @@ from src.exceptions import (
 )
 from src.schemas.hotels import HotelPATCH, HotelAdd
 from src.services.hotels import HotelService
+from src.utils.cache import (
+    key_builder_by_params,
+    key_builder_by_template,
+    cache_key,
+    invalidate_cache,
+    swr_cache,
+    HOTEL_CACHE_KEY,
+    CACHE_TTL_HOTEL,
+)
 
 router = APIRouter(prefix="/hotels", tags=["Отели"])
 
+HOTEL_OPENAPI_EXAMPLES = {
+    "1": {
+        "summary": "Сочи",
+        "value": {
+            "title": "Отель Бирсон",
+            "location": "Сочи, ул. Матросова, 13",
+        },
+    },
+    "2": {
+        "summary": "Дубай",
+        "value": {"title": "Аль-Халиф", "location": "Дубай, ул. Кан, 3"},
+    },
+}
+
 
 @router.get("/{hotel_id}", summary="Получение одного отеля")
-@cache(expire=10)
+@cache(expire=CACHE_TTL_HOTEL, key_builder=key_builder_by_template(HOTEL_CACHE_KEY))
 async def get_one_hotel(hotel_id: int, db: DBDep):
     try:
         return await HotelService(db).get_hotel(hotel_id)
@@ -28,43 +49,33 @@ async def get_one_hotel(hotel_id: int, db: DBDep):
         raise HotelNotFoundHTTPException
 
 
+# Ответ не зависит от пользователя, поэтому ключ строится только из параметров фильтрации
 @router.get("", summary="Получение отелей")
-@cache(expire=10)
+@swr_cache(
+    expire=10,
+    grace=30,
+    key_builder=key_builder_by_params("pagination", "title", "location", "dates"),
+)
 async def get_hotels(
     pagination: PaginationDep,
+    dates: DateRangeDep,
     db: DBDep,
     title: str | None = Query(None, description="Название отеля"),
     location: str | None = Query(None, description="Адрес отеля"),
-    date_from: date = Query(example="2025-08-01"),
-    date_to: date = Query(example="2025-08-07"),
 ):
     return await HotelService(db).get_hotels_by_time(
         pagination,
         title,
         location,
-        date_from,
-        date_to,
+        dates.date_from,
+        dates.date_to,
     )
 
 
 @router.post("", summary="Добавление отеля")
 async def create_hotel(
     db: DBDep,
-    hotel_data: HotelAdd = Body(
-        openapi_examples={
-            "1": {
-                "summary": "Сочи",
-                "value": {
-                    "title": "Отель Бирсон",
-                    "location": "Сочи, ул. Матросова, 13",
-                },
-            },
-            "2": {
-                "summary": "Дубай",
-                "value": {"title": "Аль-Халиф", "location": "Дубай, ул. Кан, 3"},
-            },
-        }
-    ),
+    hotel_data: HotelAdd = Body(openapi_examples=HOTEL_OPENAPI_EXAMPLES),
 ):
     try:
         hotel = await HotelService(db).add_hotel(hotel_data)
@@ -75,17 +86,16 @@ async def create_hotel(
     return {"status": "OK", "data": hotel}
 
 
-@router.put("/{hotel_id}", summary="Изменение отеля")
+@router.put("/{hotel_id}", summary="Изменение отеля", status_code=204)
 async def put_hotel(hotel_id: int, hotel_data: HotelAdd, db: DBDep):
     try:
         await HotelService(db).edit_hotel(hotel_id, hotel_data)
     except ObjectNotFoundException:
         raise HotelNotFoundHTTPException
+    await invalidate_cache(cache_key(HOTEL_CACHE_KEY, hotel_id=hotel_id))
 
-    return {"status": "OK"}
 
-
-@router.patch("/{hotel_id}", summary="Частичное изменение отеля")
+@router.patch("/{hotel_id}", summary="Частичное изменение отеля", status_code=204)
 async def patch_hotel(hotel_id: int, hotel_data: HotelPATCH, db: DBDep):
     try:
         await HotelService(db).edit_hotel_partially(hotel_id, hotel_data, exclude_unset=True)
@@ -93,15 +103,13 @@ async def patch_hotel(hotel_id: int, hotel_data: HotelPATCH, db: DBDep):
         raise HotelNotFoundHTTPException
     except NoDataHasBeenTransmitted:
         raise HTTPException(status_code=400, detail="Данные для изменения не переданы")
-
-    return {"status": "OK"}
+    await invalidate_cache(cache_key(HOTEL_CACHE_KEY, hotel_id=hotel_id))
 
 
-@router.delete("/{hotel_id}", summary="Удаление отеля")
+@router.delete("/{hotel_id}", summary="Удаление отеля", status_code=204)
 async def delete_hotel(hotel_id: int, db: DBDep):
     try:
         await HotelService(db).delete_hotel(hotel_id)
     except ObjectNotFoundException:
         raise HotelNotFoundHTTPException
-
-    return {"status": "OK!"}
+    await invalidate_cache(cache_key(HOTEL_CACHE_KEY, hotel_id=hotel_id))
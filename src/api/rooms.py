@@ -1,13 +1,11 @@
-from datetime import date
-from fastapi import APIRouter, Body, Query
+from fastapi import APIRouter, Body
 
 from fastapi_cache.decorator import cache
 
-from src.api.dependencies import DBDep
+from src.api.dependencies import DBDep, DateRangeDep, KeysetPaginationDep
 from src.exceptions import (
     ObjectNotFoundException,
     RoomNotFoundException,
-    check_date_to_after_date_from,
     HotelNotFoundHTTPException,
     RoomNotFoundHTTPException,
     HotelNotFoundException,
@@ -18,12 +16,23 @@ from src.exceptions import (
 )
 from src.schemas.rooms import RoomAddRequest, RoomPatchRequest
 from src.services.rooms import RoomService
+from src.utils.cache import (
+    key_builder_by_template,
+    single_flight,
+    cache_key,
+    invalidate_cache,
+    ROOM_CACHE_KEY,
+    ROOMS_CACHE_KEY,
+    ROOMS_CACHE_PATTERN,
+    CACHE_TTL_ROOM,
+)
 
 router = APIRouter(prefix="/hotels", tags=["Номера"])
 
 
 @router.get("/{hotel_id}/rooms/{room_id}", summary="Получение одного номера")
-@cache(expire=10)
+@cache(expire=CACHE_TTL_ROOM, key_builder=key_builder_by_template(ROOM_CACHE_KEY))
+@single_flight("hotel_id", "room_id")
 async def get_one_room(hotel_id: int, room_id: int, db: DBDep):
     try:
         return await RoomService(db).get_room(hotel_id, room_id)
@@ -34,16 +43,22 @@ async def get_one_room(hotel_id: int, room_id: int, db: DBDep):
 
 
 @router.get("/{hotel_id}/rooms", summary="Получение номеров")
-@cache(expire=10)
+@cache(expire=10, key_builder=key_builder_by_template(ROOMS_CACHE_KEY))
+@single_flight("hotel_id", "dates", "pagination")
 async def get_rooms(
     hotel_id: int,
+    dates: DateRangeDep,
     db: DBDep,
-    date_from: date = Query(example="2025-08-01"),
-    date_to: date = Query(example="2025-08-07"),
+    pagination: KeysetPaginationDep,
 ):
-    check_date_to_after_date_from(date_from, date_to)
     try:
-        return await RoomService(db).get_filtered_by_time(hotel_id, date_from, date_to)
+        return await RoomService(db).get_filtered_by_time(
+            hotel_id,
+            dates.date_from,
+            dates.date_to,
+            limit=pagination.per_page,
+            last_id=pagination.last_id,
+        )
     except ObjectNotFoundException:
         raise HotelNotFoundHTTPException
 
@@ -56,6 +71,7 @@ async def create_room(hotel_id: int, db: DBDep, room_data: RoomAddRequest = Body
         raise HotelNotFoundHTTPException
     except FacilityNotFoundCustomException as ex:
         raise FacilityNotFoundHTTPException(detail=f"{ex}")
+    await invalidate_cache(patterns=[cache_key(ROOMS_CACHE_PATTERN, hotel_id=hotel_id)])
     return {"status": "OK", "data": room}
 
 
@@ -69,11 +85,15 @@ async def put_room(room_data: RoomAddRequest, hotel_id: int, room_id: int, db: D
         raise HotelNotFoundHTTPException
     except FacilityNotFoundCustomException as ex:
         raise FacilityNotFoundHTTPException(detail=f"{ex}")
+    await invalidate_cache(
+        cache_key(ROOM_CACHE_KEY, hotel_id=hotel_id, room_id=room_id),
+        patterns=[cache_key(ROOMS_CACHE_PATTERN, hotel_id=hotel_id)],
+    )
 
     return {"status": "OK", "new_data": room}
 
 
-@router.patch("{hotel_id}/rooms/{room_id}", summary="Частичное изменение номера")
+@router.patch("/{hotel_id}/rooms/{room_id}", summary="Частичное изменение номера")
 async def patch_room(hotel_id: int, room_id: int, db: DBDep, room_data: RoomPatchRequest):
     try:
         room = await RoomService(db).edit_room_partially(hotel_id, room_id, room_data)
@@ -87,11 +107,15 @@ async def patch_room(hotel_id: int, room_id: int, db: DBDep, room_data: RoomPatc
         raise ValidationCustomHTTPException(
             detail="Пожалуйста, заполните хотя бы одно поле для изменения"
         ) from ex
+    await invalidate_cache(
+        cache_key(ROOM_CACHE_KEY, hotel_id=hotel_id, room_id=room_id),
+        patterns=[cache_key(ROOMS_CACHE_PATTERN, hotel_id=hotel_id)],
+    )
 
     return {"status": "OK", "new_data": room}
 
 
-@router.delete("{hotel_id}/rooms/{room_id}", summary="Удаление номера")
+@router.delete("/{hotel_id}/rooms/{room_id}", summary="Удаление номера", status_code=204)
 async def delete_room(hotel_id: int, room_id: int, db: DBDep):
     try:
         await RoomService(db).delete_room(hotel_id, room_id)
@@ -99,5 +123,7 @@ async def delete_room(hotel_id: int, room_id: int, db: DBDep):
         raise RoomNotFoundHTTPException
     except HotelNotFoundException:
         raise HotelNotFoundHTTPException
-
-    return {"status": "OK"}
+    await invalidate_cache(
+        cache_key(ROOM_CACHE_KEY, hotel_id=hotel_id, room_id=room_id),
+        patterns=[cache_key(ROOMS_CACHE_PATTERN, hotel_id=hotel_id)],
+    )
@@ -23,11 +23,16 @@ class Settings(BaseSettings):
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
+    # Стоимость bcrypt (2^n итераций); в тестах достаточно минимальной 4
+    BCRYPT_ROUNDS: int = 12
 
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_USER: str
 
+    # Искать свободные номера по предрассчитанной таблице room_day_bookings
+    USE_ROOM_DAY_BOOKINGS: bool = False
+
     model_config = SettingsConfigDict(env_file=".env")
 
 
@@ -1,4 +1,5 @@
 import logging
+from typing import Sequence
 
 import redis.asyncio as redis
 
@@ -12,7 +13,17 @@ class RedisManager:
     async def connector(self):
         """Устанавливает асинхронное подключение к Redis."""
         logging.info(f"Подключение к Redis host={self.host}, port={self.port}")
-        self.redis = await redis.Redis(host=self.host, port=self.port)
+        # Общий ограниченный пул: при исчерпании ждем свободное соединение, а не падаем.
+        # При установленном hiredis redis-py сам выбирает C-парсер ответов
+        pool = redis.BlockingConnectionPool(
+            host=self.host,
+            port=self.port,
+            max_connections=50,
+            timeout=5,
+            socket_keepalive=True,
+        )
+        self.redis = redis.Redis.from_pool(pool)
+        await self.redis.ping()
         logging.info(f"Успешное подключение к Redis host={self.host}, port={self.port}")
 
     async def set(self, key: str, value: str, expire: int = None):
@@ -26,11 +37,22 @@ class RedisManager:
         """Получаем значение по ключу"""
         return await self.redis.get(key)
 
-    async def delete(self, key: str):
-        """Удаляем значение по ключу"""
-        await self.redis.delete(key)
+    async def delete(self, *keys: str):
+        """Удаляем значения по ключам (без подключения к Redis ничего не делаем)"""
+        if self.redis and keys:
+            await self.redis.delete(*keys)
+
+    async def invalidate_many(self, keys: Sequence[str], patterns: Sequence[str] = ()):
+        """Удаляет ключи и все ключи по шаблонам (SCAN MATCH) одной командой DEL"""
+        if not self.redis:
+            return
+        keys = list(keys)
+        for pattern in patterns:
+            keys.extend([key async for key in self.redis.scan_iter(match=pattern)])
+        if keys:
+            await self.redis.delete(*keys)
 
     async def close(self):
         """Закрывает подключение к Redis"""
         if self.redis:
-            await self.redis.close()
+            await self.redis.aclose()
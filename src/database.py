@@ -1,12 +1,34 @@
-from sqlalchemy import NullPool
+from sqlalchemy import NullPool, AsyncAdaptedQueuePool
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
 from src.config import settings
 
 
-engine = create_async_engine(settings.DB_URL)
-engine_null_pool = create_async_engine(settings.DB_URL, poolclass=NullPool)
+# statement_cache_size - кэш подготовленных выражений asyncpg на соединение,
+# prepared_statement_cache_size - кэш SQLAlchemy-адаптера над ним
+connect_args = {"statement_cache_size": 1024, "prepared_statement_cache_size": 1024}
+# Кэш скомпилированного SQL в SQLAlchemy (по умолчанию 500 форм запросов)
+query_cache_size = 1200
+
+engine = create_async_engine(
+    settings.DB_URL,
+    connect_args=connect_args,
+    query_cache_size=query_cache_size,
+    poolclass=AsyncAdaptedQueuePool,
+    pool_size=20,
+    max_overflow=30,
+    pool_timeout=10,
+    pool_pre_ping=True,
+    # соединения старше 30 минут пересоздаются, не дожидаясь обрыва со стороны сети/БД
+    pool_recycle=1800,
+)
+engine_null_pool = create_async_engine(
+    settings.DB_URL,
+    connect_args=connect_args,
+    query_cache_size=query_cache_size,
+    poolclass=NullPool,
+)
 
 async_session_maker = async_sessionmaker(bind=engine, expire_on_commit=False)
 async_session_maker_null_pool = async_sessionmaker(bind=engine_null_pool, expire_on_commit=False)
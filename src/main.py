@@ -1,12 +1,14 @@
 # ruff: noqa: E402
+import asyncio
 import logging
+import os
 from contextlib import asynccontextmanager
 import sys
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.openapi.docs import get_swagger_ui_html
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi_cache import FastAPICache
 from fastapi_cache.backends.redis import RedisBackend
 import uvicorn
@@ -23,22 +25,23 @@ from src.api.bookings import router as router_bookings
 from src.api.facilities import router as router_facilities
 from src.api.images import router as router_images
 
+from src.config import settings
 from src.connectors.db_connector import check_connection_db
 from src.init import redis_manager
+from src.utils.cache import ORJsonCoder, CACHE_PREFIX
 
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):
-    await check_connection_db()
-
-    await redis_manager.connector()
-    FastAPICache.init(RedisBackend(redis_manager.redis), prefix="fastapi-cache")
+    # Проверка БД и подключение к Redis независимы, поэтому идут параллельно
+    await asyncio.gather(check_connection_db(), redis_manager.connector())
+    FastAPICache.init(RedisBackend(redis_manager.redis), prefix=CACHE_PREFIX, coder=ORJsonCoder)
     logging.info("✅  FastAPI cache initialized")
     yield
     await redis_manager.close()
 
 
-app = FastAPI(docs_url=None, lifespan=lifespan)
+app = FastAPI(docs_url=None, lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.include_router(router_auth)
 app.include_router(router_hotels)
@@ -48,12 +51,19 @@ app.include_router(router_facilities)
 app.include_router(router_images)
 
 
-@app.get("/", tags=["Шаблоны"], summary="Домашняя страница", response_class=HTMLResponse)
-def home():
-    return """
+# Страница статическая: ответ собирается один раз, а браузеры и CDN могут его кэшировать
+HOME_RESPONSE = HTMLResponse(
+    content="""
     <a href="https://vhotelok.ru/docs">Docs</a><br>
     <a href="https://vhotelok.ru/redoc">ReDoc</a>
-    """
+    """,
+    headers={"Cache-Control": "public, max-age=3600"},
+)
+
+
+@app.get("/", tags=["Шаблоны"], summary="Домашняя страница", response_class=HTMLResponse)
+async def home():
+    return HOME_RESPONSE
 
 
 @app.get("/docs", include_in_schema=False)
@@ -68,4 +78,14 @@ async def custom_swagger_ui_html():
 
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", reload=True)
+    if settings.MODE == "LOCAL":
+        uvicorn.run("main:app", host="0.0.0.0", reload=True)
+    else:
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count())),
+            loop="uvloop",
+            http="httptools",
+            access_log=False,
+        )
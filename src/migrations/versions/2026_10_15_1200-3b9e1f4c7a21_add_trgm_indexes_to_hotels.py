@@ -0,0 +1,55 @@
+"""add trgm indexes to hotels
+
+Revision ID: 3b9e1f4c7a21
+Revises: ad3ad1de1b30
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b9e1f4c7a21"
+down_revision: Union[str, None] = "ad3ad1de1b30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_hotels_title_trgm",
+        "hotels",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_hotels_location_trgm",
+        "hotels",
+        ["location"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"location": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_hotels_location_trgm",
+        table_name="hotels",
+        postgresql_using="gin",
+        postgresql_ops={"location": "gin_trgm_ops"},
+    )
+    op.drop_index(
+        "ix_hotels_title_trgm",
+        table_name="hotels",
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
@@ -0,0 +1,33 @@
+"""add room dates index to bookings
+
+Revision ID: 7d2c5a9e4b18
+Revises: 3b9e1f4c7a21
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2c5a9e4b18"
+down_revision: Union[str, None] = "3b9e1f4c7a21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_bookings_room_dates",
+        "bookings",
+        ["room_id", "date_from", "date_to"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_bookings_room_dates", table_name="bookings")
@@ -0,0 +1,38 @@
+"""add unique room facilities
+
+Revision ID: c41e8b2f6d90
+Revises: 7d2c5a9e4b18
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41e8b2f6d90"
+down_revision: Union[str, None] = "7d2c5a9e4b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Перед созданием ограничения убираем дубли, оставляя связь с меньшим id
+    op.execute(
+        """
+        DELETE FROM room_facilities a
+        USING room_facilities b
+        WHERE a.room_id = b.room_id
+            AND a.facility_id = b.facility_id
+            AND a.id > b.id
+        """
+    )
+    op.create_unique_constraint("uq_room_facilities", "room_facilities", ["room_id", "facility_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_room_facilities", "room_facilities", type_="unique")
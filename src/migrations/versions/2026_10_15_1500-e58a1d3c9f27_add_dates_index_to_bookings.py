@@ -0,0 +1,34 @@
+"""add dates index to bookings
+
+Revision ID: e58a1d3c9f27
+Revises: c41e8b2f6d90
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e58a1d3c9f27"
+down_revision: Union[str, None] = "c41e8b2f6d90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_bookings_dates",
+        "bookings",
+        ["date_from", "date_to"],
+        unique=False,
+        postgresql_include=["room_id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_bookings_dates", table_name="bookings")
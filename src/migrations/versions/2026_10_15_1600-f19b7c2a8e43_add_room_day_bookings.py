@@ -0,0 +1,49 @@
+"""add room day bookings
+
+Revision ID: f19b7c2a8e43
+Revises: e58a1d3c9f27
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.models.bookings import (
+    ROOM_DAY_BOOKINGS_BACKFILL,
+    ROOM_DAY_BOOKINGS_FUNCTION,
+    ROOM_DAY_BOOKINGS_TRIGGER,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f19b7c2a8e43"
+down_revision: Union[str, None] = "e58a1d3c9f27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "room_day_bookings",
+        sa.Column("room_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("rooms_booked", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["room_id"], ["rooms.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("room_id", "day"),
+    )
+    # DDL общий с моделью: create_all в тестах и миграция ставят один и тот же триггер
+    op.execute(ROOM_DAY_BOOKINGS_FUNCTION)
+    op.execute(ROOM_DAY_BOOKINGS_TRIGGER)
+    # Заполняем таблицу по уже существующим бронированиям
+    op.execute(ROOM_DAY_BOOKINGS_BACKFILL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS bookings_refresh_room_day_bookings ON bookings")
+    op.execute("DROP FUNCTION IF EXISTS refresh_room_day_bookings()")
+    op.drop_table("room_day_bookings")
@@ -0,0 +1,59 @@
+"""add unique facilities title
+
+Revision ID: a83d5f1e2c64
+Revises: f19b7c2a8e43
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a83d5f1e2c64"
+down_revision: Union[str, None] = "f19b7c2a8e43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Дубли названий сливаем в удобство с меньшим id: сначала убираем связи,
+    # которые после переноса нарушили бы uq_room_facilities, затем переносим остальные
+    op.execute(
+        """
+        CREATE TEMPORARY TABLE facilities_dups ON COMMIT DROP AS
+        SELECT f.id AS old_id, keep.id AS new_id
+        FROM facilities f
+        JOIN (SELECT title, min(id) AS id FROM facilities GROUP BY title) keep
+            ON keep.title = f.title AND keep.id <> f.id
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM room_facilities rf
+        USING facilities_dups d
+        WHERE rf.facility_id = d.old_id
+            AND EXISTS (
+                SELECT 1 FROM room_facilities other
+                WHERE other.room_id = rf.room_id AND other.facility_id = d.new_id
+            )
+        """
+    )
+    op.execute(
+        """
+        UPDATE room_facilities rf
+        SET facility_id = d.new_id
+        FROM facilities_dups d
+        WHERE rf.facility_id = d.old_id
+        """
+    )
+    op.execute("DELETE FROM facilities f USING facilities_dups d WHERE f.id = d.old_id")
+    op.create_unique_constraint("uq_facilities_title", "facilities", ["title"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("uq_facilities_title", "facilities", type_="unique")
@@ -1,7 +1,7 @@
 from src.models.hotels import HotelsModel
 from src.models.rooms import RoomsModel
 from src.models.users import UsersModel
-from src.models.bookings import BookingsModel
+from src.models.bookings import BookingsModel, RoomDayBookingsModel
 from src.models.facilities import FacilitiesModel
 
 __all__ = (
@@ -9,5 +9,6 @@ __all__ = (
     "RoomsModel",
     "UsersModel",
     "BookingsModel",
+    "RoomDayBookingsModel",
     "FacilitiesModel",
 )
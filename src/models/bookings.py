@@ -1,11 +1,15 @@
 from datetime import date
+import typing
 
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DDL, ForeignKey, Index, event
 
 from src.database import Base
 
+if typing.TYPE_CHECKING:
+    from src.models import UsersModel
+
 
 class BookingsModel(Base):
     __tablename__ = "bookings"
@@ -17,6 +21,72 @@ class BookingsModel(Base):
     date_to: Mapped[date]
     price: Mapped[int]
 
+    user: Mapped["UsersModel"] = relationship()
+
+    # ix_bookings_room_dates покрывает подсчет пересекающихся бронирований по номеру,
+    # ix_bookings_dates - выборку по диапазону дат (в т.ч. заезды на сегодня)
+    __table_args__ = (
+        Index("ix_bookings_room_dates", "room_id", "date_from", "date_to"),
+        Index("ix_bookings_dates", "date_from", "date_to", postgresql_include=["room_id"]),
+    )
+
     @hybrid_property
     def total_cost(self) -> int:
         return self.price * (self.date_to - self.date_from).days
+
+
+class RoomDayBookingsModel(Base):
+    """Число броней номера на каждый день. Ведется триггером на bookings,
+    чтобы поиск свободных номеров не агрегировал бронирования на каждый запрос.
+    Бронь занимает дни с date_from по date_to включительно - так же,
+    как считает пересечения rooms_ids_for_booking"""
+
+    __tablename__ = "room_day_bookings"
+
+    room_id: Mapped[int] = mapped_column(
+        ForeignKey("rooms.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(primary_key=True)
+    rooms_booked: Mapped[int]
+
+
+ROOM_DAY_BOOKINGS_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION refresh_room_day_bookings() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE room_day_bookings SET rooms_booked = rooms_booked - 1
+            WHERE room_id = OLD.room_id AND day BETWEEN OLD.date_from AND OLD.date_to;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO room_day_bookings (room_id, day, rooms_booked)
+            SELECT NEW.room_id, NEW.date_from + day_offset, 1
+            FROM generate_series(0, NEW.date_to - NEW.date_from) AS day_offset
+            ON CONFLICT (room_id, day)
+            DO UPDATE SET rooms_booked = room_day_bookings.rooms_booked + 1;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+)
+ROOM_DAY_BOOKINGS_TRIGGER = DDL(
+    """
+    CREATE TRIGGER bookings_refresh_room_day_bookings
+    AFTER INSERT OR UPDATE OF room_id, date_from, date_to OR DELETE ON bookings
+    FOR EACH ROW EXECUTE FUNCTION refresh_room_day_bookings()
+    """
+)
+# Заполнение по уже существующим бронированиям, выполняется в миграции
+ROOM_DAY_BOOKINGS_BACKFILL = DDL(
+    """
+    INSERT INTO room_day_bookings (room_id, day, rooms_booked)
+    SELECT room_id, date_from + day_offset, count(*)
+    FROM bookings, generate_series(0, date_to - date_from) AS day_offset
+    GROUP BY room_id, date_from + day_offset
+    """
+)
+
+# Для create_all (тесты): триггер создается, когда уже есть обе таблицы
+event.listen(Base.metadata, "after_create", ROOM_DAY_BOOKINGS_FUNCTION)
+event.listen(Base.metadata, "after_create", ROOM_DAY_BOOKINGS_TRIGGER)
@@ -1,7 +1,7 @@
 import typing
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, UniqueConstraint
 
 from src.database import Base
 
@@ -19,6 +19,9 @@ class FacilitiesModel(Base):
         back_populates="facilities", secondary="room_facilities"
     )
 
+    # Уникальность названия проверяет БД: повторный INSERT дает ObjectAlreadyExistsException
+    __table_args__ = (UniqueConstraint("title", name="uq_facilities_title"),)
+
 
 class RoomFacilitiesModel(Base):
     __tablename__ = "room_facilities"
@@ -28,3 +31,6 @@ class RoomFacilitiesModel(Base):
     facility_id: Mapped[int] = mapped_column(
         ForeignKey("facilities.id", ondelete="CASCADE"), nullable=True
     )
+
+    # Нужен для INSERT ... ON CONFLICT DO NOTHING в edit_room_with_facilities
+    __table_args__ = (UniqueConstraint("room_id", "facility_id", name="uq_room_facilities"),)
@@ -3,8 +3,20 @@ import logging
 
 from asyncpg.exceptions import UniqueViolationError, PostgresSyntaxError
 
-from sqlalchemy import select, insert, update, delete
-from sqlalchemy.exc import NoResultFound, IntegrityError, ProgrammingError
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    literal,
+    values,
+    column,
+    event,
+    Row,
+    RowMapping,
+)
+from sqlalchemy.exc import IntegrityError, ProgrammingError
+from sqlalchemy.orm import Session, ORMExecuteState
 from pydantic import BaseModel
 
 from src.exceptions import (
@@ -15,6 +27,22 @@ from src.exceptions import (
 from src.repositories.mappers.base import DataMapper
 
 
+REQUEST_CACHE_KEY = "repository_request_cache"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _reset_request_cache(orm_execute_state: ORMExecuteState) -> None:
+    """Любое изменение данных через сессию сбрасывает кэш выборок get_one"""
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info.pop(REQUEST_CACHE_KEY, None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _reset_request_cache_on_rollback(session: Session, previous_transaction) -> None:
+    """После отката в кэше могли остаться строки, которые так и не были закоммичены"""
+    session.info.pop(REQUEST_CACHE_KEY, None)
+
+
 class BaseRepository:
     model = None
     schema: BaseModel = None
@@ -23,41 +51,93 @@ class BaseRepository:
     def __init__(self, session):
         self.session = session
 
-    async def get_filtered(self, *filters, **filter_by):
-        query = select(self.model).filter(*filters).filter_by(**filter_by)
-        # print(query.compile(compile_kwargs={"literal_binds": True}))
+    async def get_filtered(self, *filters, options: Sequence = (), **filter_by):
+        """options - опции загрузки связей (selectinload, joinedload), как и в get_one"""
+        query = select(self.model).options(*options).filter(*filters).filter_by(**filter_by)
         result = await self.session.execute(query)
-        return [self.mapper.map_to_domain_entity(model) for model in result.scalars().all()]
+        return self.mapper.map_to_domain_entities(result.scalars().all())
 
     async def get_all(self):
         return await self.get_filtered()
 
-    async def get_one_or_none(self, **filter_by) -> BaseModel | None | Any:
-        query = select(self.model).filter_by(**filter_by)
+    async def get_all_mapped(self, *columns) -> Sequence[RowMapping]:
+        """Возвращает строки как словари без создания ОРМ объектов и Pydantic схем.
+        Подходит для списков только на чтение, где не нужны связи"""
+        query = select(*(columns or self.model.__table__.columns))
         result = await self.session.execute(query)
+        return result.mappings().all()
+
+    async def get_one_or_none(self, options: Sequence = (), **filter_by) -> BaseModel | None | Any:
+        """options - опции загрузки связей (selectinload, joinedload), чтобы избежать N+1.
+
+        Выборки без options кэшируются в session.info на время запроса: повторный вызов
+        с теми же фильтрами не идет в БД. Кэш сбрасывается при любом INSERT/UPDATE/DELETE
+        через сессию и при откате (см. _reset_request_cache), между запросами он не живет"""
+        cache_key = None if options else self._request_cache_key(filter_by)
+        cache = self.session.info.setdefault(REQUEST_CACHE_KEY, {})
+        if cache_key is not None and cache_key in cache:
+            return cache[cache_key]
+
+        result = await self.session.execute(self._get_one_query(options, **filter_by))
         model = result.scalars().one_or_none()
-        if model is None:
+        entity = None if model is None else self.mapper.map_to_domain_entity(model)
+        if cache_key is not None:
+            cache[cache_key] = entity
+        return entity
+
+    def _request_cache_key(self, filter_by: dict) -> tuple | None:
+        """Ключ кэша get_one_or_none; для нехэшируемых значений фильтра - None (без кэша)"""
+        cache_key = (type(self).__name__, frozenset(filter_by.items()))
+        try:
+            hash(cache_key)
+        except TypeError:
             return None
-        return self.mapper.map_to_domain_entity(model)
+        return cache_key
 
-    async def get_one(self, **filter_by) -> BaseModel:
-        query = select(self.model).filter_by(**filter_by)
-        result = await self.session.execute(query)
-        try:
-            model = result.scalar_one()
-        except NoResultFound:
+    def _get_one_query(self, options: Sequence = (), **filter_by):
+        """Запрос для get_one_or_none. Репозитории переопределяют его для частых выборок
+        по id, чтобы собрать запрос через lambda_stmt и не компилировать его каждый раз"""
+        return select(self.model).options(*options).filter_by(**filter_by)
+
+    async def get_one(self, options: Sequence = (), **filter_by) -> BaseModel:
+        entity = await self.get_one_or_none(options, **filter_by)
+        if entity is None:
             raise ObjectNotFoundException
+        return entity
 
-        return self.mapper.map_to_domain_entity(model)
+    async def exists(self, **filter_by) -> bool:
+        """SELECT 1 ... LIMIT 1: проверка наличия строки без выборки и маппинга данных"""
+        query = select(literal(1)).select_from(self.model).filter_by(**filter_by).limit(1)
+        return await self.session.scalar(query) is not None
 
     async def add(self, data: BaseModel, **kwargs):
+        add_data_stmt = (
+            insert(self.model).values({**data.model_dump(), **kwargs}).returning(self.model)
+        )
+        result = await self._execute_insert(add_data_stmt)
+        model = result.scalars().one()
+        return self.mapper.map_to_domain_entity(model)
+
+    async def add_if(self, data: BaseModel, condition) -> Row | None:
+        """INSERT ... SELECT ... WHERE condition RETURNING *: строка вставляется, только если
+        условие истинно. Проверка и вставка идут одним запросом; None - условие ложно"""
+        values = data.model_dump()
+        table = self.model.__table__
+        select_values = select(
+            *(literal(value, table.c[key].type).label(key) for key, value in values.items())
+        ).where(condition)
+        add_stmt = insert(table).from_select(list(values), select_values).returning(*table.c)
+        result = await self.session.execute(add_stmt)
+        return result.one_or_none()
+
+    async def add_without_returning(self, data: BaseModel, **kwargs) -> None:
+        """INSERT без RETURNING, когда вызывающему коду не нужна созданная строка"""
+        add_data_stmt = insert(self.model).values({**data.model_dump(), **kwargs})
+        await self._execute_insert(add_data_stmt)
+
+    async def _execute_insert(self, add_data_stmt):
         try:
-            add_data_stmt = (
-                insert(self.model).values({**data.model_dump(), **kwargs}).returning(self.model)
-            )
-            result = await self.session.execute(add_data_stmt)
-            model = result.scalars().one()
-            return self.mapper.map_to_domain_entity(model)
+            return await self.session.execute(add_data_stmt)
         except IntegrityError as ex:
             if isinstance(ex.orig.__cause__, UniqueViolationError):
                 raise ObjectAlreadyExistsException from ex
@@ -65,39 +145,57 @@ class BaseRepository:
                 logging.error(f"Неизвестная ошибка: {type(ex.orig.__cause__)=}")
                 raise ex
 
-    async def add_bulk(self, data: Sequence[BaseModel]):
-        add_data_stmt = insert(self.model).values([item.model_dump() for item in data])
-        await self.session.execute(add_data_stmt)
-
-    async def edit(self, data: BaseModel, exclude_unset: bool = False, **filter_by):
+    async def add_bulk(self, data: Sequence[BaseModel], batch_size: int = 1000):
+        # executemany-форма: один и тот же INSERT для любого числа строк (кэшируется),
+        # SQLAlchemy сам пакует строки в multi-VALUES батчи.
+        # batch_size ограничивает размер одного executemany для больших загрузок
+        for start in range(0, len(data), batch_size):
+            batch = data[start : start + batch_size]
+            await self.session.execute(insert(self.model), [item.model_dump() for item in batch])
+
+    async def edit(self, data: BaseModel | dict, exclude_unset: bool = False, **filter_by):
+        """data может быть уже готовым словарем значений, тогда схема не собирается повторно.
+        UPDATE ... RETURNING заодно проверяет существование строки: отдельный SELECT не нужен"""
+        values = data if isinstance(data, dict) else data.model_dump(exclude_unset=exclude_unset)
         try:
             edit_stmt = (
-                update(self.model)
-                .filter_by(**filter_by)
-                .values(**data.model_dump(exclude_unset=exclude_unset))
-                .returning(self.model)
+                update(self.model).filter_by(**filter_by).values(**values).returning(self.model)
             )
             result = await self.session.execute(edit_stmt)
-            model = result.scalar_one()
-
-            return self.mapper.map_to_domain_entity(model)
+            model = result.scalar_one_or_none()
         except ProgrammingError as ex:
             if isinstance(ex.orig.__cause__, PostgresSyntaxError):
                 raise NoDataHasBeenTransmitted from ex
             else:
                 logging.error(f"Неизвестная ошибка: {type(ex.orig.__cause__)=}")
                 raise ex
+        if model is None:
+            raise ObjectNotFoundException
+        return self.mapper.map_to_domain_entity(model)
 
     async def edit_bulk(
-        self, data: list[BaseModel], exclude_unset: bool = False, **filter_by
+        self, data: Sequence[BaseModel], key: str = "id", exclude_unset: bool = False
     ) -> None:
+        """Один UPDATE ... FROM (VALUES ...) для всех строк вместо запроса на каждую.
+        key - колонка, по которой строки сопоставляются; набор полей у всех элементов одинаковый"""
+        if not data:
+            return
+        rows = [item.model_dump(exclude_unset=exclude_unset) for item in data]
+        table = self.model.__table__
+        names = list(rows[0])
+        new_values = values(
+            *(column(name, table.c[name].type) for name in names), name="new_values"
+        ).data([tuple(row[name] for name in names) for row in rows])
         edit_stmt = (
-            update(self.model)
-            .filter_by(**filter_by)
-            .values([item.model_dump(exclude_unset=exclude_unset) for item in data])
+            update(table)
+            .values({name: new_values.c[name] for name in names if name != key})
+            .where(table.c[key] == new_values.c[key])
         )
         await self.session.execute(edit_stmt)
 
     async def delete(self, **filter_by) -> None:
-        delete_stmt = delete(self.model).filter_by(**filter_by)
-        await self.session.execute(delete_stmt)
+        """DELETE ... RETURNING id: если не удалено ни одной строки - ObjectNotFoundException"""
+        delete_stmt = delete(self.model).filter_by(**filter_by).returning(self.model.id)
+        result = await self.session.execute(delete_stmt)
+        if result.first() is None:
+            raise ObjectNotFoundException
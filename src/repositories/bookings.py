@@ -1,13 +1,14 @@
 from datetime import date
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import select, lambda_stmt
+from sqlalchemy.orm import joinedload
 
 from src.exceptions import AllRoomsAreBookedException
 from src.models import RoomsModel
 from src.models.bookings import BookingsModel
 from src.repositories.base import BaseRepository
-from src.repositories.mappers.mappers import BookingDataMapper
+from src.repositories.mappers.mappers import BookingDataMapper, BookingWithUserDataMapper
 from src.repositories.utils import rooms_ids_for_booking
 
 
@@ -16,9 +17,15 @@ class BookingsRepository(BaseRepository):
     mapper = BookingDataMapper
 
     async def get_bookings_with_today_checkin(self):
-        query = select(BookingsModel).filter(BookingsModel.date_from == date.today())
+        """Бронирования с заездом сегодня вместе с пользователями (одним запросом через JOIN)"""
+        today = date.today()
+        query = lambda_stmt(
+            lambda: select(BookingsModel)
+            .options(joinedload(BookingsModel.user))
+            .where(BookingsModel.date_from == today)
+        )
         res = await self.session.execute(query)
-        return [self.mapper.map_to_domain_entity(booking) for booking in res.scalars().all()]
+        return BookingWithUserDataMapper.map_to_domain_entities(res.scalars().all())
 
     async def add_booking(
         self,
@@ -28,13 +35,14 @@ class BookingsRepository(BaseRepository):
         date_from: date,
         date_to: date,
     ):
-        rooms_ids_to_get = rooms_ids_for_booking(date_from, date_to, hotel_id=hotel_id)
-
-        query = select(RoomsModel.id).filter(RoomsModel.id.in_(rooms_ids_to_get))
-        result = await self.session.execute(query)
-        rooms_ids_db = result.scalars().all()
-
-        if room_id not in rooms_ids_db:
+        # Проверка свободных мест и вставка брони выполняются одним запросом
+        room_is_available = (
+            rooms_ids_for_booking(date_from, date_to, hotel_id=hotel_id)
+            .filter(RoomsModel.id == room_id)
+            .exists()
+        )
+        booking = await self.add_if(data, room_is_available)
+        if booking is None:
             raise AllRoomsAreBookedException
 
-        return await self.add(data)
+        return self.mapper.map_to_domain_entity(booking)
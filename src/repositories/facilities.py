@@ -1,9 +1,14 @@
-from sqlalchemy import select, delete, insert
+from typing import Sequence
 
+from pydantic import BaseModel
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.exceptions import ObjectAlreadyExistsException
 from src.models.facilities import FacilitiesModel, RoomFacilitiesModel
-from src.repositories.base import BaseRepository
+from src.repositories.base import BaseRepository, REQUEST_CACHE_KEY
 from src.repositories.mappers.mappers import FacilityDataMapper
-from src.schemas.facilities import Facility, RoomFacility
+from src.schemas.facilities import Facility, RoomFacility, RoomFacilityAdd
 
 
 class FacilitiesRepository(BaseRepository):
@@ -11,13 +16,29 @@ class FacilitiesRepository(BaseRepository):
     schema = Facility
     mapper = FacilityDataMapper
 
-    async def get_by_ids(self, ids: list[int]) -> list[Facility]:
+    async def add(self, data: BaseModel, **kwargs) -> Facility:
+        """INSERT ... ON CONFLICT (title) DO NOTHING RETURNING *: дубль названия не роняет
+        транзакцию ошибкой, а просто не возвращает строку"""
+        add_data_stmt = (
+            pg_insert(self.model)
+            .values({**data.model_dump(), **kwargs})
+            .on_conflict_do_nothing(index_elements=["title"])
+            .returning(self.model)
+        )
+        result = await self.session.execute(add_data_stmt)
+        model = result.scalars().one_or_none()
+        if model is None:
+            raise ObjectAlreadyExistsException
+        return self.mapper.map_to_domain_entity(model)
+
+    async def get_existing_ids(self, ids: list[int]) -> set[int]:
+        """Из переданных id возвращает только существующие; сами строки удобств не читаются"""
         if not ids:
-            return []
+            return set()
 
-        query = select(self.model).where(self.model.id.in_(ids))
+        query = select(self.model.id).where(self.model.id.in_(ids))
         result = await self.session.execute(query)
-        return result.scalars().all()
+        return set(result.scalars().all())
 
 
 class RoomFacilitiesRepository(BaseRepository):
@@ -25,32 +46,41 @@ class RoomFacilitiesRepository(BaseRepository):
     schema = RoomFacility
     mapper = FacilityDataMapper
 
-    async def edit_room_with_facilities(self, room_id: int, facilities_ids: list[int]) -> None:
-        get_current_facilities_ids_query = await self.session.execute(
-            select(self.model.facility_id).select_from(self.model).filter_by(room_id=room_id)
-        )
-        current_facilities_ids = get_current_facilities_ids_query.scalars().all()
+    COPY_THRESHOLD = 100
 
-        ids_to_delete = (
-            list(set(current_facilities_ids) - set(facilities_ids))
-            if facilities_ids is not None
-            else current_facilities_ids
-        )
+    async def add_bulk(self, data: Sequence[RoomFacilityAdd], batch_size: int = 1000) -> None:
+        """Большие пачки загружаются через COPY asyncpg в той же транзакции сессии.
+        Транзакция должна быть уже начата предыдущим запросом (например, INSERT номера)"""
+        if len(data) <= self.COPY_THRESHOLD:
+            return await super().add_bulk(data, batch_size)
 
-        ids_to_insert = (
-            list(set(facilities_ids) - set(current_facilities_ids))
-            if facilities_ids is not None
-            else []
+        # COPY идет мимо сессии, поэтому кэш выборок запроса сбрасываем сами
+        self.session.info.pop(REQUEST_CACHE_KEY, None)
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.model.__tablename__,
+            records=[(item.room_id, item.facility_id) for item in data],
+            columns=["room_id", "facility_id"],
         )
 
-        if ids_to_delete:
-            delete_facilities_stmt = delete(self.model).filter(
-                self.model.room_id == room_id, self.model.facility_id.in_(ids_to_delete)
+    async def edit_room_with_facilities(self, room_id: int, facilities_ids: list[int]) -> None:
+        """Два запроса без предварительного SELECT: удаляем лишние связи,
+        недостающие вставляем с ON CONFLICT DO NOTHING (уже существующие пропускаются)"""
+        facilities_ids = list(set(facilities_ids or []))
+
+        delete_facilities_stmt = delete(self.model).filter(self.model.room_id == room_id)
+        if facilities_ids:
+            delete_facilities_stmt = delete_facilities_stmt.filter(
+                self.model.facility_id.notin_(facilities_ids)
             )
-            await self.session.execute(delete_facilities_stmt)
+        await self.session.execute(delete_facilities_stmt)
 
-        if ids_to_insert:
-            insert_facilities_stmt = insert(self.model).values(
-                [{"room_id": room_id, "facility_id": fid} for fid in ids_to_insert]
+        if facilities_ids:
+            insert_facilities_stmt = pg_insert(self.model).on_conflict_do_nothing(
+                index_elements=["room_id", "facility_id"]
+            )
+            await self.session.execute(
+                insert_facilities_stmt,
+                [{"room_id": room_id, "facility_id": fid} for fid in facilities_ids],
             )
-            await self.session.execute(insert_facilities_stmt)
@@ -1,6 +1,7 @@
 from datetime import date
+from typing import Sequence
 
-from sqlalchemy import select, func
+from sqlalchemy import select, lambda_stmt
 
 from src.models.rooms import RoomsModel
 from src.repositories.base import BaseRepository
@@ -14,6 +15,12 @@ class HotelsRepository(BaseRepository):
     model = HotelsModel
     mapper = HotelDataMapper
 
+    def _get_one_query(self, options: Sequence = (), **filter_by):
+        if options or filter_by.keys() != {"id"}:
+            return super()._get_one_query(options, **filter_by)
+        hotel_id = filter_by["id"]
+        return lambda_stmt(lambda: select(HotelsModel).where(HotelsModel.id == hotel_id))
+
     async def get_hotels_by_time(
         self,
         date_from: date,
@@ -22,7 +29,9 @@ class HotelsRepository(BaseRepository):
         location: str,
         limit: int,
         offset: int,
+        last_id: int | None = None,
     ) -> list[Hotel]:
+        """Если передан last_id, используется keyset-пагинация (id > last_id) вместо OFFSET"""
         rooms_ids_to_get = rooms_ids_for_booking(date_from=date_from, date_to=date_to)
 
         hotels_ids_to_get = (
@@ -31,16 +40,22 @@ class HotelsRepository(BaseRepository):
             .filter(RoomsModel.id.in_(rooms_ids_to_get))
         )
 
-        query = select(HotelsModel).filter(HotelsModel.id.in_(hotels_ids_to_get))
+        # Только колонки схемы Hotel: строки без ORM-объектов и identity map
+        query = select(HotelsModel.id, HotelsModel.title, HotelsModel.location).filter(
+            HotelsModel.id.in_(hotels_ids_to_get)
+        )
 
+        # ILIKE по самой колонке (без lower), чтобы использовались триграммные GIN-индексы
         if title:
-            query = query.filter(func.lower(HotelsModel.title).contains(title.strip().lower()))
+            query = query.filter(HotelsModel.title.ilike(f"%{title.strip()}%"))
         if location:
-            query = query.filter(
-                func.lower(HotelsModel.location).contains(location.strip().lower())
-            )
-        query = query.limit(limit).offset(offset)
+            query = query.filter(HotelsModel.location.ilike(f"%{location.strip()}%"))
+        if last_id is not None:
+            query = query.filter(HotelsModel.id > last_id)
+        else:
+            query = query.offset(offset)
+        query = query.order_by(HotelsModel.id).limit(limit)
 
         result = await self.session.execute(query)
 
-        return [self.mapper.map_to_domain_entity(model) for model in result.scalars().all()]
+        return self.mapper.map_to_domain_entities(result.all())
@@ -12,10 +12,22 @@ class DataMapper:
     db_model: type[DBModel] = None
     schema: type[SchemaType] = None
 
+    # Связи-списки, которые собираются своими мапперами: {"facilities": FacilityDataMapper}
+    nested_mappers: dict[str, type["DataMapper"]] = {}
+
     @classmethod
     def map_to_domain_entity(cls, data):
-        """Принимаем данные из ОРМ модели и превращаем их в Pydantic схему"""
-        return cls.schema.model_validate(data, from_attributes=True)
+        """Принимаем данные из ОРМ модели и превращаем их в Pydantic схему.
+        Данные из БД уже корректны, поэтому схема собирается без повторной валидации"""
+        values = {field: getattr(data, field) for field in cls.schema.model_fields}
+        for field, mapper in cls.nested_mappers.items():
+            values[field] = [mapper.map_to_domain_entity(item) for item in values[field]]
+        return cls.schema.model_construct(**values)
+
+    @classmethod
+    def map_to_domain_entities(cls, data) -> list:
+        """Список собирается тем же путем, что и одна сущность (с nested_mappers)"""
+        return [cls.map_to_domain_entity(item) for item in data]
 
     @classmethod
     def map_to_persistence_entity(cls, data):
@@ -4,7 +4,7 @@ from src.models.hotels import HotelsModel
 from src.models.rooms import RoomsModel
 from src.models.users import UsersModel
 from src.repositories.mappers.base import DataMapper
-from src.schemas.bookings import Booking
+from src.schemas.bookings import Booking, BookingWithUser
 from src.schemas.facilities import Facility
 from src.schemas.hotels import Hotel
 from src.schemas.rooms import Room, RoomWithRels
@@ -29,6 +29,7 @@ class RoomDataMapper(DataMapper):
 class RoomWithRelsDataMapper(DataMapper):
     db_model = RoomsModel
     schema = RoomWithRels
+    nested_mappers = {"facilities": FacilityDataMapper}
 
 
 class UserDataMapper(DataMapper):
@@ -44,3 +45,8 @@ class UserWithHashedPasswordDataMapper(DataMapper):
 class BookingDataMapper(DataMapper):
     db_model = BookingsModel
     schema = Booking
+
+
+class BookingWithUserDataMapper(DataMapper):
+    db_model = BookingsModel
+    schema = BookingWithUser
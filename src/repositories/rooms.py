@@ -1,23 +1,34 @@
 from datetime import date
-from typing import Any
+from typing import Any, Sequence
 
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import select, exists, func, lambda_stmt, Row
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.orm import selectinload
 
-from src.exceptions import RoomNotFoundException
+from src.exceptions import RoomNotFoundException, HotelNotFoundException
 from src.repositories.base import BaseRepository
+from src.models.facilities import FacilitiesModel
+from src.models.hotels import HotelsModel
 from src.models.rooms import RoomsModel
 from src.repositories.mappers.mappers import RoomDataMapper, RoomWithRelsDataMapper
 from src.repositories.utils import rooms_ids_for_booking
+from src.schemas.rooms import RoomAdd
 
 
 class RoomsRepository(BaseRepository):
     model = RoomsModel
     mapper = RoomDataMapper
 
-    async def get_filtered_by_time(self, hotel_id, date_from: date, date_to: date):
+    async def get_filtered_by_time(
+        self,
+        hotel_id,
+        date_from: date,
+        date_to: date,
+        limit: int | None = None,
+        last_id: int | None = None,
+    ):
+        """Keyset-пагинация: следующая страница начинается после last_id"""
         rooms_ids_to_get = rooms_ids_for_booking(date_from, date_to, hotel_id=hotel_id)
 
         query = (
@@ -25,26 +36,84 @@ class RoomsRepository(BaseRepository):
             .options(selectinload(self.model.facilities))
             .filter(RoomsModel.id.in_(rooms_ids_to_get))
         )
+        if last_id is not None:
+            query = query.filter(RoomsModel.id > last_id)
+        query = query.order_by(RoomsModel.id).limit(limit)
         result = await self.session.execute(query)
-        return [
-            RoomWithRelsDataMapper.map_to_domain_entity(model) for model in result.scalars().all()
-        ]
+        return RoomWithRelsDataMapper.map_to_domain_entities(result.scalars().all())
 
-    async def get_one_or_none(self, **filter_by) -> BaseModel | None | Any:
-        query = (
-            select(self.model).options(selectinload(self.model.facilities)).filter_by(**filter_by)
+    async def add_to_existing_hotel(self, data: RoomAdd) -> int:
+        """Вставляет номер, только если отель существует, и возвращает id нового номера"""
+        row = await self.add_if(data, exists().where(HotelsModel.id == data.hotel_id))
+        if row is None:
+            raise HotelNotFoundException
+        return row.id
+
+    async def get_edit_preconditions(
+        self, hotel_id: int, room_id: int, facilities_ids: list[int] | None = None
+    ) -> Row:
+        """
+        select exists(select 1 from hotels where id = 1) as hotel_exists,
+            exists(select 1 from rooms where id = 2) as room_exists,
+            (select array_agg(id) from facilities where id in (3, 4)) as facilities_ids
+
+        Все проверки перед изменением номера одним запросом вместо трех
+        """
+        found_facilities_ids = (
+            select(func.array_agg(FacilitiesModel.id))
+            .where(FacilitiesModel.id.in_(facilities_ids or []))
+            .scalar_subquery()
+        )
+        query = select(
+            exists().where(HotelsModel.id == hotel_id).label("hotel_exists"),
+            exists().where(RoomsModel.id == room_id).label("room_exists"),
+            found_facilities_ids.label("facilities_ids"),
+        )
+        result = await self.session.execute(query)
+        return result.one()
+
+    def _get_one_query(self, options: Sequence = (), **filter_by):
+        """Номер вместе с удобствами; выборки по id и (hotel_id, id) идут через lambda_stmt"""
+        if options or not filter_by.keys() <= {"id", "hotel_id"} or "id" not in filter_by:
+            return (
+                select(self.model)
+                .options(selectinload(self.model.facilities), *options)
+                .filter_by(**filter_by)
+            )
+
+        room_id = filter_by["id"]
+        query = lambda_stmt(
+            lambda: select(RoomsModel)
+            .options(selectinload(RoomsModel.facilities))
+            .where(RoomsModel.id == room_id)
+        )
+        if "hotel_id" in filter_by:
+            hotel_id = filter_by["hotel_id"]
+            query += lambda s: s.where(RoomsModel.hotel_id == hotel_id)
+        return query
+
+    async def get_one_for_update(self, room_id: int) -> BaseModel:
+        """SELECT ... FOR UPDATE: строка номера блокируется до конца транзакции,
+        параллельные бронирования этого номера выполняются по очереди"""
+        query = lambda_stmt(
+            lambda: select(RoomsModel).where(RoomsModel.id == room_id).with_for_update()
         )
         result = await self.session.execute(query)
+        try:
+            model = result.scalar_one()
+        except NoResultFound:
+            raise RoomNotFoundException
+        return self.mapper.map_to_domain_entity(model)
+
+    async def get_one_or_none(self, options: Sequence = (), **filter_by) -> BaseModel | None | Any:
+        result = await self.session.execute(self._get_one_query(options, **filter_by))
         model = result.scalars().one_or_none()
         if model is None:
             return None
         return RoomWithRelsDataMapper.map_to_domain_entity(model)
 
-    async def get_one(self, **filter_by) -> BaseModel:
-        query = (
-            select(self.model).options(selectinload(self.model.facilities)).filter_by(**filter_by)
-        )
-        result = await self.session.execute(query)
+    async def get_one(self, options: Sequence = (), **filter_by) -> BaseModel:
+        result = await self.session.execute(self._get_one_query(options, **filter_by))
         try:
             model = result.scalar_one()
         except NoResultFound:
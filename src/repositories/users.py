@@ -1,5 +1,7 @@
+from typing import Sequence
+
 from pydantic import EmailStr
-from sqlalchemy import select
+from sqlalchemy import select, lambda_stmt
 
 from src.models.users import UsersModel
 from src.repositories.base import BaseRepository
@@ -13,8 +15,15 @@ class UsersRepository(BaseRepository):
     model = UsersModel
     mapper = UserDataMapper
 
+    def _get_one_query(self, options: Sequence = (), **filter_by):
+        if options or filter_by.keys() != {"id"}:
+            return super()._get_one_query(options, **filter_by)
+        user_id = filter_by["id"]
+        return lambda_stmt(lambda: select(UsersModel).where(UsersModel.id == user_id))
+
     async def get_user_with_hashed_password(self, email: EmailStr):
-        query = select(self.model).filter_by(email=email)
+        # lambda_stmt: Select строится и кэшируется один раз, email подставляется параметром
+        query = lambda_stmt(lambda: select(UsersModel).where(UsersModel.email == email))
         result = await self.session.execute(query)
         model = result.scalars().one_or_none()
         if model is None:
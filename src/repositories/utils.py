@@ -1,8 +1,9 @@
 from datetime import date
 
-from sqlalchemy import select, func, Select, Subquery
+from sqlalchemy import select, func, Select
 
-from src.models.bookings import BookingsModel
+from src.config import settings
+from src.models.bookings import BookingsModel, RoomDayBookingsModel
 from src.models.rooms import RoomsModel
 
 
@@ -12,56 +13,71 @@ def rooms_ids_for_booking(
     hotel_id: int | None = None,
 ) -> Select:
     """
-    with rooms_count as (
+    select rooms.id from rooms
+    left join (
         select room_id, count(*) as rooms_booked from bookings
         where date_from <= '2025-10-07' and date_to >= '2025-08-01'
         group by room_id
-    ),
+    ) as rooms_count on rooms.id = rooms_count.room_id
+    where rooms.quantity - coalesce(rooms_booked, 0) > 0
+        and rooms.hotel_id = 1
 
-    rooms_left_table as (
-        select rooms.id as room_id, quantity - coalesce(rooms_booked, 0) as rooms_left
-        from rooms
-        left join rooms_count on rooms.id = rooms_count.room_id
-    )
-
-    select * from rooms_left_table
-    where rooms_left > 0
+    Подзапрос вместо CTE встраивается в запрос, и вся выборка планируется одним проходом
     """
+    if settings.USE_ROOM_DAY_BOOKINGS:
+        return rooms_ids_by_day_bookings(date_from, date_to, hotel_id)
+
     rooms_count = (
         select(BookingsModel.room_id, func.count("*").label("rooms_booked"))
         .select_from(BookingsModel)
         .filter(BookingsModel.date_from <= date_to, BookingsModel.date_to >= date_from)
         .group_by(BookingsModel.room_id)
-        .cte(name="rooms_count")
+        .subquery(name="rooms_count")
     )
 
-    rooms_left_table = (
-        select(
-            RoomsModel.id.label("room_id"),
-            (RoomsModel.quantity - func.coalesce(rooms_count.c.rooms_booked, 0)).label(
-                "rooms_left"
-            ),
-        )
+    rooms_ids_to_get = (
+        select(RoomsModel.id)
         .select_from(RoomsModel)
         .outerjoin(rooms_count, RoomsModel.id == rooms_count.c.room_id)
-        .cte(name="rooms_left_table")
+        .filter(RoomsModel.quantity - func.coalesce(rooms_count.c.rooms_booked, 0) > 0)
     )
-
-    rooms_ids_for_hotel = select(RoomsModel.id).select_from(RoomsModel)
     if hotel_id is not None:
-        rooms_ids_for_hotel = rooms_ids_for_hotel.filter_by(hotel_id=hotel_id)
+        rooms_ids_to_get = rooms_ids_to_get.filter(RoomsModel.hotel_id == hotel_id)
+
+    return rooms_ids_to_get
+
 
-    get_rooms_ids_for_hotel_subq: Subquery = rooms_ids_for_hotel.subquery(
-        name="get_rooms_ids_for_hotel"
+def rooms_ids_by_day_bookings(
+    date_from: date,
+    date_to: date,
+    hotel_id: int | None = None,
+) -> Select:
+    """
+    select rooms.id from rooms
+    where not exists (
+        select 1 from room_day_bookings
+        where room_day_bookings.room_id = rooms.id
+            and day between '2025-08-01' and '2025-10-07'
+            and rooms_booked >= rooms.quantity
     )
 
-    rooms_ids_to_get = (
-        select(rooms_left_table.c.room_id)
-        .select_from(rooms_left_table)
+    Номер свободен, если ни на один день периода он не занят полностью. Границы
+    включительные, как и в rooms_ids_for_booking. В отличие от нее брони,
+    не пересекающиеся друг с другом внутри периода, не суммируются.
+    Проверка идет по первичному ключу (room_id, day) без агрегации бронирований
+    """
+    fully_booked_day = (
+        select(RoomDayBookingsModel.room_id)
         .filter(
-            rooms_left_table.c.rooms_left > 0,
-            rooms_left_table.c.room_id.in_(get_rooms_ids_for_hotel_subq),  # type: ignore
+            RoomDayBookingsModel.room_id == RoomsModel.id,
+            RoomDayBookingsModel.day.between(date_from, date_to),
+            RoomDayBookingsModel.rooms_booked >= RoomsModel.quantity,
         )
+        .exists()
     )
 
+    rooms_ids_to_get = select(RoomsModel.id).select_from(RoomsModel).filter(~fully_booked_day)
+    if hotel_id is not None:
+        rooms_ids_to_get = rooms_ids_to_get.filter(RoomsModel.hotel_id == hotel_id)
+
     return rooms_ids_to_get
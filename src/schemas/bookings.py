@@ -2,6 +2,8 @@ from datetime import date
 
 from pydantic import BaseModel, ConfigDict
 
+from src.schemas.users import User
+
 
 class BookingAddRequest(BaseModel):
     room_id: int
@@ -18,3 +20,7 @@ class Booking(BookingAdd):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class BookingWithUser(Booking):
+    user: User
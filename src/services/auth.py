@@ -1,5 +1,14 @@
+import asyncio
+import base64
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
+import hashlib
+import hmac
+import os
+import time
 
+from cachetools import TTLCache
+import orjson
 from passlib.context import CryptContext
 import jwt
 from pydantic import ValidationError
@@ -17,20 +26,59 @@ from src.schemas.users import UserRequestAdd, UserAdd, UserLogin
 from src.services.base import BaseService
 
 
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
+# Отдельный пул под bcrypt: он отпускает GIL, поэтому хэши считаются параллельно по ядрам
+# и не занимают общий пул asyncio.to_thread (сохранение файлов и т.п.)
+password_hash_executor = ThreadPoolExecutor(
+    max_workers=os.cpu_count(), thread_name_prefix="password-hash"
+)
+# Хэш для проверки, когда пользователь не найден: время ответа не выдает наличие email
+DUMMY_PASSWORD_HASH = pwd_context.hash("dummy-password")
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# Для HS*-алгоритмов заголовок токена и HMAC с ключом готовятся один раз при импорте,
+# на каждый токен ключ не пересчитывается - копируется уже инициализированный HMAC
+_JWT_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+_jwt_digest = _JWT_HMAC_DIGESTS.get(settings.JWT_ALGORITHM)
+_jwt_signer = (
+    hmac.new(settings.JWT_SECRET_KEY.encode(), digestmod=_jwt_digest) if _jwt_digest else None
+)
+_jwt_header = _b64url(orjson.dumps({"alg": settings.JWT_ALGORITHM, "typ": "JWT"}))
+
+
 class AuthService(BaseService):
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    __slots__ = ()
+
+    pwd_context = pwd_context
+    # (хэш из БД, sha256 введенного пароля) -> True. Кэшируются только успешные проверки:
+    # неверный пароль всегда стоит полного bcrypt, и подбор не ускоряется. Цена - повторный
+    # вход с верным паролем в течение ttl отвечает быстрее, но это различимо только для того,
+    # кто пароль уже знает
+    _verify_cache: TTLCache = TTLCache(maxsize=4096, ttl=30)
+    # токен -> проверенный payload; срок действия (exp) сверяется при каждом обращении
+    _token_cache: TTLCache = TTLCache(maxsize=4096, ttl=300)
 
     @staticmethod
     def create_access_token(data: dict) -> str:
-        to_encode = data.copy()
         expire = datetime.now(timezone.utc) + timedelta(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
-        to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(
-            to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
-        )
-        return encoded_jwt
+        if _jwt_signer is None:
+            to_encode = {**data, "exp": expire}
+            return jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+
+        # то же, что jwt.encode: exp в секундах, header.payload.signature в base64url
+        to_encode = {**data, "exp": int(expire.timestamp())}
+        signing_input = _jwt_header + b"." + _b64url(orjson.dumps(to_encode))
+        signer = _jwt_signer.copy()
+        signer.update(signing_input)
+        return (signing_input + b"." + _b64url(signer.digest())).decode()
 
     def verify_password(self, plain_password, hashed_password):
         return self.pwd_context.verify(plain_password, hashed_password)
@@ -38,17 +86,50 @@ class AuthService(BaseService):
     def hash_password(self, password: str) -> str:
         return self.pwd_context.hash(password)
 
-    @staticmethod
-    def decode_token(token: str) -> dict:
-        try:
-            return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        except jwt.exceptions.DecodeError:
-            raise IncorrectTokenException
+    async def verify_password_async(self, plain_password, hashed_password) -> bool:
+        """Проверяет пароль в отдельном потоке, не блокируя event loop.
+        Успешная проверка для пары пароль/хэш кэшируется на несколько секунд"""
+        key = (hashed_password, hashlib.sha256(plain_password.encode()).digest())
+        if key in self._verify_cache:
+            return True
+        is_valid = await self._verify_password_in_executor(plain_password, hashed_password)
+        if is_valid:
+            self._verify_cache[key] = True
+        return is_valid
+
+    async def _verify_password_in_executor(self, plain_password, hashed_password) -> bool:
+        """Полная проверка bcrypt в пуле password_hash_executor, без кэша"""
+        return await asyncio.get_running_loop().run_in_executor(
+            password_hash_executor, self.verify_password, plain_password, hashed_password
+        )
+
+    async def hash_password_async(self, password: str) -> str:
+        """Хэширует пароль в отдельном потоке, не блокируя event loop"""
+        return await asyncio.get_running_loop().run_in_executor(
+            password_hash_executor, self.hash_password, password
+        )
+
+    @classmethod
+    def decode_token(cls, token: str) -> dict:
+        """Подпись токена проверяется один раз, дальше payload берется из кэша"""
+        payload = cls._token_cache.get(token)
+        if payload is None:
+            try:
+                payload = jwt.decode(
+                    token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM]
+                )
+            except jwt.exceptions.DecodeError:
+                raise IncorrectTokenException
+            cls._token_cache[token] = payload
+        elif "exp" in payload and payload["exp"] <= time.time():
+            # из кэша может вернуться уже истекший токен - ведем себя как jwt.decode
+            raise jwt.exceptions.ExpiredSignatureError("Signature has expired")
+        return dict(payload)
 
     async def register_user(self, data: UserRequestAdd) -> None:
         if not data.password:
             raise ValidationException
-        hashed_password = AuthService().hash_password(data.password)
+        hashed_password = await self.hash_password_async(data.password)
         try:
             new_user_data = UserAdd(
                 first_name=data.first_name,
@@ -60,7 +141,7 @@ class AuthService(BaseService):
         except ValidationError as ex:
             raise ValidationException from ex
         try:
-            await self.db.users.add(new_user_data)
+            await self.db.users.add_without_returning(new_user_data)
             await self.db.session_commit()
 
         except ObjectAlreadyExistsException as ex:
@@ -69,10 +150,15 @@ class AuthService(BaseService):
     async def login_user(self, data: UserLogin) -> str:
         user = await self.db.users.get_user_with_hashed_password(email=data.email)
         if not user:
+            # мимо кэша: неизвестный email всегда стоит полного bcrypt, как и известный
+            await self._verify_password_in_executor(data.password, DUMMY_PASSWORD_HASH)
             raise EmailNotRegisteredException
-        if not AuthService().verify_password(data.password, user.hashed_password):
+        if not await self.verify_password_async(data.password, user.hashed_password):
             raise IncorrectPasswordException
-        return AuthService().create_access_token({"user_id": user.id})
+        return self.create_access_token({"user_id": user.id})
 
     async def get_one_or_none_user(self, user_id: int):
         return await self.db.users.get_one_or_none(id=user_id)
+
+
+auth_service = AuthService()
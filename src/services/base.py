@@ -2,5 +2,8 @@ from src.utils.db_manager import DBManager
 
 
 class BaseService:
+    # Сервисы создаются на каждый запрос: без __dict__ экземпляр меньше, а self.db быстрее
+    __slots__ = ("db",)
+
     def __init__(self, db: DBManager | None = None) -> None:
         self.db = db
@@ -5,6 +5,8 @@ from src.services.rooms import RoomService
 
 
 class BookingService(BaseService):
+    __slots__ = ()
+
     async def get_bookings(self):
         return await self.db.bookings.get_all()
 
@@ -12,9 +14,13 @@ class BookingService(BaseService):
         return await self.db.bookings.get_filtered(user_id=user_id)
 
     async def create_booking(self, user_id: UserIdDep, booking_data: BookingAddRequest):
-        room_data = await RoomService(self.db).get_room_with_check(booking_data.room_id)
+        # блокировка номера до коммита: две параллельные брони не пройдут проверку мест
+        # одновременно и не превысят quantity
+        room_data = await RoomService(self.db).get_room_with_check(
+            booking_data.room_id, for_update=True
+        )
         hotel_id = room_data.hotel_id
-        _booking_data = BookingAdd(
+        _booking_data = BookingAdd.model_construct(
             user_id=user_id, price=room_data.price, **booking_data.model_dump()
         )
         booking = await self.db.bookings.add_booking(
@@ -1,16 +1,16 @@
-from src.exceptions import ObjectAlreadyExistsException
 from src.schemas.facilities import FacilityAdd
 from src.services.base import BaseService
 
 
 class FacilityService(BaseService):
+    __slots__ = ()
+
     async def get_facilities(self):
-        return await self.db.facilities.get_all()
+        return await self.db.facilities.get_all_mapped()
 
     async def create_facility(self, data: FacilityAdd):
-        facilities = await self.get_facilities()
-        if data.title in [entity.title for entity in facilities]:
-            raise ObjectAlreadyExistsException
+        # Дубль названия отсекает ON CONFLICT по uq_facilities_title: add поднимет
+        # ObjectAlreadyExistsException
         facility = await self.db.facilities.add(data)
         await self.db.session_commit()
 
@@ -18,13 +18,10 @@ class FacilityService(BaseService):
         return facility
 
     async def get_missing_facility_with_check(self, facilities_ids: list[int]) -> list[int]:
-        if facilities_ids:
-            unique_ids = list(set(facilities_ids))
-
-            facilities = await self.db.facilities.get_by_ids(facilities_ids)
-
-            found_ids = {facility.id for facility in facilities}
-            missing_ids = set(unique_ids) - found_ids
+        if not facilities_ids:
+            return None
 
-            if missing_ids:
-                return list(missing_ids)
+        found_ids = await self.db.facilities.get_existing_ids(facilities_ids)
+        missing_ids = set(facilities_ids) - found_ids
+        if missing_ids:
+            return list(missing_ids)
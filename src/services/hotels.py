@@ -6,12 +6,15 @@ from src.exceptions import (
     ObjectNotFoundException,
     HotelNotFoundException,
     ObjectAlreadyExistsException,
+    NoDataHasBeenTransmitted,
 )
 from src.schemas.hotels import HotelAdd, HotelPATCH, Hotel
 from src.services.base import BaseService
 
 
 class HotelService(BaseService):
+    __slots__ = ()
+
     async def get_hotels_by_time(
         self,
         pagination: PaginationDep,
@@ -29,6 +32,7 @@ class HotelService(BaseService):
             date_to=date_to,
             limit=per_page,
             offset=per_page * (pagination.page - 1),
+            last_id=pagination.last_id,
         )
 
     async def get_hotel(self, hotel_id: int):
@@ -41,23 +45,25 @@ class HotelService(BaseService):
         await self.db.session_commit()
         return hotel
 
+    # существование отеля проверяют сами UPDATE/DELETE ... RETURNING
     async def edit_hotel(self, hotel_id: int, hotel_data: HotelAdd):
-        await self.db.hotels.get_one(id=hotel_id)
-
         await self.db.hotels.edit(hotel_data, id=hotel_id)
         await self.db.session_commit()
 
     async def edit_hotel_partially(
         self, hotel_id: int, hotel_data: HotelPATCH, exclude_unset: bool = False
     ):
-        await self.db.hotels.get_one(id=hotel_id)
+        values = hotel_data.model_dump(exclude_unset=exclude_unset)
+        if not values:
+            # пустой UPDATE не выполнить, поэтому существование отеля проверяем отдельно:
+            # несуществующий отель - 404, пустые данные для существующего - 400
+            await self.check_hotel_exists_by_id(hotel_id)
+            raise NoDataHasBeenTransmitted
 
-        await self.db.hotels.edit(hotel_data, exclude_unset=exclude_unset, id=hotel_id)
+        await self.db.hotels.edit(values, id=hotel_id)
         await self.db.session_commit()
 
     async def delete_hotel(self, hotel_id: int):
-        await self.db.hotels.get_one(id=hotel_id)
-
         await self.db.hotels.delete(id=hotel_id)
         await self.db.session_commit()
 
@@ -67,5 +73,9 @@ class HotelService(BaseService):
         except ObjectNotFoundException:
             raise HotelNotFoundException
 
+    async def check_hotel_exists_by_id(self, hotel_id: int) -> None:
+        if not await self.db.hotels.exists(id=hotel_id):
+            raise HotelNotFoundException
+
     async def check_hotel_exists(self, location: str, title: str):
         return await self.db.hotels.get_one_or_none(location=location, title=title)
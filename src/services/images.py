@@ -1,3 +1,5 @@
+import asyncio
+import os
 import shutil
 
 from fastapi import UploadFile, BackgroundTasks
@@ -8,18 +10,55 @@ from src.tasks.tasks import resize_image
 
 
 class ImagesService(BaseService):
-    ALLOWED_IMAGE_TYPES = {"jpeg", "jpg", "png", "webp"}
+    __slots__ = ()
 
-    def upload_image(self, file: UploadFile, backgrounds_tasks: BackgroundTasks):
-        file_extension = file.filename.split(".")[-1].lower()
+    ALLOWED_IMAGE_TYPES = frozenset({"jpeg", "jpg", "png", "webp"})
+
+    async def upload_image(self, file: UploadFile, backgrounds_tasks: BackgroundTasks):
+        _, _, file_extension = file.filename.rpartition(".")
+        file_extension = file_extension.lower()
         if file_extension not in self.ALLOWED_IMAGE_TYPES:
             raise UnavailableFileFormatException(
                 detail=f".{file_extension} недопустимый формат файла. Разрешены: {', '.join(self.ALLOWED_IMAGE_TYPES)}"
             )
 
+        # расширению не доверяем: сверяем первые байты файла с сигнатурой формата
+        header = await file.read(12)
+        if not self._is_image_signature(header):
+            raise UnavailableFileFormatException(
+                detail="Содержимое файла не соответствует формату изображения"
+            )
+        await file.seek(0)
+
+        # копирование целиком уходит в один поток, event loop не блокируется
         image_path = f"src/static/images/{file.filename}"
-        with open(image_path, "wb+") as new_file:
-            shutil.copyfileobj(file.file, new_file)
+        await asyncio.to_thread(self._save_file, file, image_path)
+
+        # resize_image.delay(image_path)
+        backgrounds_tasks.add_task(resize_image, image_path)
 
-            # resize_image.delay(image_path)
-            backgrounds_tasks.add_task(resize_image, image_path)
+    @staticmethod
+    def _is_image_signature(header: bytes) -> bool:
+        return (
+            header.startswith(b"\x89PNG\r\n\x1a\n")
+            or header.startswith(b"\xff\xd8\xff")
+            or (header[:4] == b"RIFF" and header[8:12] == b"WEBP")
+        )
+
+    @staticmethod
+    def _save_file(file: UploadFile, image_path: str) -> None:
+        with open(image_path, "wb+") as new_file:
+            # Большой файл starlette уже сбросил во временный файл на диске: копируем его
+            # через sendfile внутри ядра. Маленький файл в памяти копируем как обычно,
+            # чтобы не вызывать fileno() - он принудительно сбросил бы файл на диск
+            if hasattr(os, "sendfile") and getattr(file.file, "_rolled", False):
+                src_fd = file.file.fileno()
+                size = os.fstat(src_fd).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(new_file.fileno(), src_fd, offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            else:
+                shutil.copyfileobj(file.file, new_file)
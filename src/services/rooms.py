@@ -1,21 +1,24 @@
 from datetime import date
 
 from src.exceptions import (
+    HotelNotFoundException,
     ObjectNotFoundException,
     RoomNotFoundException,
     ValidationException,
     FacilityNotFoundCustomException,
 )
 from src.schemas.facilities import RoomFacilityAdd
-from src.schemas.rooms import RoomAdd, RoomAddRequest, RoomPatchRequest, RoomPatch, Room
+from src.schemas.rooms import RoomAdd, RoomAddRequest, RoomPatchRequest, Room
 from src.services.base import BaseService
 from src.services.facilities import FacilityService
 from src.services.hotels import HotelService
 
 
 class RoomService(BaseService):
+    __slots__ = ()
+
     async def get_room(self, hotel_id: int, room_id: int):
-        await HotelService(self.db).get_hotel_with_check(hotel_id)
+        await HotelService(self.db).check_hotel_exists_by_id(hotel_id)
         return await self.db.rooms.get_one(hotel_id=hotel_id, id=room_id)
 
     async def get_filtered_by_time(
@@ -23,75 +26,114 @@ class RoomService(BaseService):
         hotel_id: int,
         date_from: date,
         date_to: date,
+        limit: int | None = None,
+        last_id: int | None = None,
     ):
-        await self.db.hotels.get_one(id=hotel_id)
+        await HotelService(self.db).check_hotel_exists_by_id(hotel_id)
 
         return await self.db.rooms.get_filtered_by_time(
-            hotel_id=hotel_id, date_from=date_from, date_to=date_to
+            hotel_id=hotel_id,
+            date_from=date_from,
+            date_to=date_to,
+            limit=limit,
+            last_id=last_id,
         )
 
     async def add_room(self, hotel_id: int, room_data: RoomAddRequest):
-        await HotelService(self.db).get_hotel_with_check(hotel_id)
         await self.check_missing_facilities_ids(room_data)
 
-        _room_data = RoomAdd(hotel_id=hotel_id, **room_data.model_dump())
-        room = await self.db.rooms.add(_room_data)
+        _room_data = RoomAdd.model_construct(hotel_id=hotel_id, **room_data.model_dump())
+        # существование отеля проверяется в том же INSERT
+        room_id = await self.db.rooms.add_to_existing_hotel(_room_data)
 
         if room_data.facilities_ids:
+            # id уже провалидированы запросом и проверены в БД, повторная валидация не нужна
             room_facilities_data = [
-                RoomFacilityAdd(room_id=room.id, facility_id=facility)
-                for facility in room_data.facilities_ids
+                RoomFacilityAdd.model_construct(room_id=room_id, facility_id=facility)
+                for facility in set(room_data.facilities_ids)
             ]
             await self.db.room_facilities.add_bulk(room_facilities_data)
+        # перечитываем номер до коммита, в той же транзакции
+        room = await self.db.rooms.get_one(id=room_id)
         await self.db.session_commit()
-        return await self.db.rooms.get_one(id=room.id)
+        return room
 
     async def edit_room(self, hotel_id: int, room_id: int, room_data: RoomAddRequest):
-        _room_data = RoomAdd(hotel_id=hotel_id, **room_data.model_dump())
-        await HotelService(self.db).get_hotel_with_check(hotel_id)
-        await self.get_room_with_check(room_id)
-        await self.check_missing_facilities_ids(room_data)
+        await self.check_edit_preconditions(hotel_id, room_id, room_data.facilities_ids)
 
-        await self.db.rooms.edit(_room_data, id=room_id)
+        # запрос уже провалидирован FastAPI, в UPDATE передаем готовый словарь
+        _room_data = room_data.model_dump(exclude={"facilities_ids"})
+        await self.db.rooms.edit({**_room_data, "hotel_id": hotel_id}, id=room_id)
         await self.db.room_facilities.edit_room_with_facilities(
             room_id, facilities_ids=room_data.facilities_ids
         )
+        room = await self.db.rooms.get_one(id=room_id)
         await self.db.session_commit()
-        return await self.db.rooms.get_one(id=room_id)
+        return room
 
     async def edit_room_partially(self, hotel_id: int, room_id: int, room_data: RoomPatchRequest):
-        await HotelService(self.db).get_hotel_with_check(hotel_id)
-        await self.get_room_with_check(room_id)
-        await self.check_missing_facilities_ids(room_data)
+        await self.check_edit_preconditions(hotel_id, room_id, room_data.facilities_ids)
 
         _room_data_dict = room_data.model_dump(exclude_unset=True)
         if not _room_data_dict:
             raise ValidationException
-        _room_data = RoomPatch(hotel_id=hotel_id, **_room_data_dict)
+        _room_data = {
+            key: value for key, value in _room_data_dict.items() if key != "facilities_ids"
+        }
 
-        await self.db.rooms.edit(_room_data, exclude_unset=True, id=room_id, hotel_id=hotel_id)
+        if _room_data:
+            try:
+                await self.db.rooms.edit(_room_data, id=room_id, hotel_id=hotel_id)
+            except ObjectNotFoundException:
+                # номер существует, но принадлежит другому отелю
+                raise RoomNotFoundException
 
         if "facilities_ids" in _room_data_dict:
             await self.db.room_facilities.edit_room_with_facilities(
                 room_id, facilities_ids=_room_data_dict["facilities_ids"]
             )
+        room = await self.db.rooms.get_one(hotel_id=hotel_id, id=room_id)
         await self.db.session_commit()
-        return await self.db.rooms.get_one(hotel_id=hotel_id, id=room_id)
+        return room
 
     async def delete_room(self, hotel_id: int, room_id: int):
-        await HotelService(self.db).get_hotel_with_check(hotel_id)
-        await self.get_room_with_check(room_id)
+        await self.check_edit_preconditions(hotel_id, room_id)
 
-        await self.db.rooms.delete(hotel_id=hotel_id, id=room_id)
+        try:
+            await self.db.rooms.delete(hotel_id=hotel_id, id=room_id)
+        except ObjectNotFoundException:
+            raise RoomNotFoundException
         await self.db.session_commit()
 
-    async def get_room_with_check(self, room_id: int) -> Room:
+    async def get_room_with_check(self, room_id: int, for_update: bool = False) -> Room:
         try:
+            if for_update:
+                return await self.db.rooms.get_one_for_update(room_id)
             return await self.db.rooms.get_one(id=room_id)
         except ObjectNotFoundException:
             raise RoomNotFoundException
 
+    async def check_edit_preconditions(
+        self, hotel_id: int, room_id: int, facilities_ids: list[int] | None = None
+    ) -> None:
+        preconditions = await self.db.rooms.get_edit_preconditions(
+            hotel_id, room_id, facilities_ids
+        )
+        if not preconditions.hotel_exists:
+            raise HotelNotFoundException
+        if not preconditions.room_exists:
+            raise RoomNotFoundException
+
+        if facilities_ids:
+            missing_ids = set(facilities_ids) - set(preconditions.facilities_ids or [])
+            if missing_ids:
+                raise FacilityNotFoundCustomException(
+                    f"Удобства с ID {list(missing_ids)} не найдены"
+                )
+
     async def check_missing_facilities_ids(self, data: RoomAddRequest | RoomPatchRequest) -> None:
+        if not data.facilities_ids:
+            return
         missing_ids = await FacilityService(self.db).get_missing_facility_with_check(
             facilities_ids=data.facilities_ids
         )
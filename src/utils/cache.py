@@ -0,0 +1,263 @@
+import asyncio
+from functools import wraps
+import hashlib
+import inspect
+from typing import Any, Callable, Sequence
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi_cache.coder import Coder
+import orjson
+
+from src.init import redis_manager
+
+CACHE_PREFIX = "fastapi-cache"
+
+CACHE_TTL_HOTEL = 300
+CACHE_TTL_ROOM = 300
+
+HOTEL_CACHE_KEY = "hotel:{hotel_id}"
+ROOM_CACHE_KEY = "room:{hotel_id}:{room_id}"
+ROOMS_CACHE_KEY = "rooms:{hotel_id}:{dates.date_from}:{dates.date_to}:{pagination}"
+ROOMS_CACHE_PATTERN = "rooms:{hotel_id}:*"
+
+
+class ORJsonCoder(Coder):
+    """Кодировщик кэша на orjson вместо стандартного json"""
+
+    @classmethod
+    def encode(cls, value: Any) -> bytes:
+        if isinstance(value, Response):
+            return value.body
+        return orjson.dumps(value, default=jsonable_encoder)
+
+    @classmethod
+    def decode(cls, value: bytes) -> Any:
+        return orjson.loads(value)
+
+
+class RawJsonCoder(ORJsonCoder):
+    """Отдает попадание в кэш готовыми байтами, минуя повторную сериализацию FastAPI"""
+
+    @classmethod
+    def decode_as_type(cls, value: bytes, *, type_: Any = None) -> Response:
+        return Response(content=value, media_type="application/json")
+
+
+def key_builder_by_params(*param_names: str) -> Callable:
+    """Строит ключ кэша только из указанных параметров эндпоинта.
+
+    Стандартный key_builder хэширует все аргументы, включая DBManager,
+    который создается заново на каждый запрос, поэтому ключ никогда не совпадает.
+    """
+
+    def key_builder(
+        func: Callable,
+        namespace: str = "",
+        *,
+        request: Request | None = None,
+        response: Response | None = None,
+        args: tuple = (),
+        kwargs: dict | None = None,
+    ) -> str:
+        kwargs = kwargs or {}
+        params = ":".join(f"{name}={kwargs.get(name)}" for name in param_names)
+        return f"{namespace}:{func.__module__}:{func.__name__}:{params}"
+
+    return key_builder
+
+
+def cache_key(template: str, **params) -> str:
+    """Полный ключ кэша по шаблону, например cache_key(HOTEL_CACHE_KEY, hotel_id=1)"""
+    return f"{CACHE_PREFIX}:{template.format(**params)}"
+
+
+def key_builder_by_template(template: str) -> Callable:
+    """Стабильный ключ вида hotel:{hotel_id}, который можно сбросить при изменении объекта"""
+
+    def key_builder(
+        func: Callable,
+        namespace: str = "",
+        *,
+        request: Request | None = None,
+        response: Response | None = None,
+        args: tuple = (),
+        kwargs: dict | None = None,
+    ) -> str:
+        return cache_key(template, **(kwargs or {}))
+
+    return key_builder
+
+
+async def invalidate_cache(*keys: str, patterns: Sequence[str] = ()) -> None:
+    """Сбрасывает ключи и ключи по шаблонам за один DEL"""
+    await redis_manager.invalidate_many(keys, patterns)
+
+
+# Незавершенные запросы к БД процесса: ключ -> Future с результатом
+_inflight: dict[str, asyncio.Future] = {}
+
+
+class _LeaderCancelled(Exception):
+    """Первый вызов отменен (например, клиент отключился): ожидающие выполняют запрос сами"""
+
+
+def single_flight(*param_names: str) -> Callable:
+    """Объединяет одновременные одинаковые вызовы в один.
+
+    Пока первый вызов с теми же значениями param_names выполняется,
+    остальные не идут в БД, а ждут и получают его результат (или исключение).
+    Если первый вызов отменен, ожидающие не наследуют отмену: один из них
+    становится новым первым, остальные ждут уже его.
+    Ставится под @cache, чтобы при истечении кэша в БД шел один запрос.
+    """
+
+    def wrapper(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            params = ":".join(f"{arguments.get(name)}" for name in param_names)
+            key = f"{func.__module__}:{func.__name__}:{params}"
+
+            while (future := _inflight.get(key)) is not None:
+                try:
+                    return await asyncio.shield(future)
+                except _LeaderCancelled:
+                    continue
+
+            future = asyncio.get_running_loop().create_future()
+            _inflight[key] = future
+            try:
+                result = await func(*args, **kwargs)
+            except asyncio.CancelledError:
+                future.set_exception(_LeaderCancelled())
+                future.exception()
+                raise
+            except Exception as ex:
+                future.set_exception(ex)
+                # помечаем исключение полученным, даже если ожидающих не было
+                future.exception()
+                raise
+            else:
+                future.set_result(result)
+                return result
+            finally:
+                _inflight.pop(key, None)
+
+        return inner
+
+    return wrapper
+
+
+def etag_response(payload: bytes, request: Request, response: Response, coder: type[Coder]):
+    """Отвечает 304 Not Modified, если у клиента уже есть эта версия ответа"""
+    etag = f'W/"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return coder.decode(payload)
+
+
+def swr_cache(
+    expire: int,
+    grace: int,
+    key_builder: Callable,
+    coder: type[Coder] = ORJsonCoder,
+    lock_timeout_ms: int = 5000,
+) -> Callable:
+    """Кэш stale-while-revalidate с поддержкой ETag/If-None-Match.
+
+    Значение считается свежим expire секунд и хранится еще grace секунд.
+    Когда оно устарело, обновляет его только один запрос (захвативший блокировку
+    SET NX), остальные в это время получают устаревшее значение, а не идут в БД.
+    """
+
+    def wrapper(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            request: Request = kwargs.pop("swr_request")
+            response: Response = kwargs.pop("swr_response")
+            redis = redis_manager.redis
+            if redis is None:
+                return await func(*args, **kwargs)
+
+            key = key_builder(func, f"{CACHE_PREFIX}:swr", kwargs=kwargs)
+            async with redis.pipeline(transaction=False) as pipe:
+                cached, ttl = await pipe.get(key).ttl(key).execute()
+
+            if cached is not None and ttl > grace:
+                return etag_response(cached, request, response, coder)
+
+            lock_key = f"{key}:lock"
+            if await redis.set(lock_key, 1, nx=True, px=lock_timeout_ms):
+                try:
+                    payload = coder.encode(await func(*args, **kwargs))
+                    await redis.set(key, payload, ex=expire + grace)
+                finally:
+                    await redis.delete(lock_key)
+                return etag_response(payload, request, response, coder)
+
+            if cached is not None:
+                return etag_response(cached, request, response, coder)
+            return await func(*args, **kwargs)
+
+        # FastAPI передаст Request/Response в обертку, сама функция их не принимает
+        inner.__signature__ = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    "swr_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+                ),
+                inspect.Parameter(
+                    "swr_response", inspect.Parameter.KEYWORD_ONLY, annotation=Response
+                ),
+            ]
+        )
+        return inner
+
+    return wrapper
+
+
+def private_cache(expire: int, key_builder: Callable, coder: type[Coder] = ORJsonCoder) -> Callable:
+    """Серверный кэш в Redis для ответов, привязанных к пользователю.
+
+    В отличие от @cache не отдает Cache-Control: max-age и ETag, а помечает ответ
+    private, no-store: иначе общий прокси или CDN мог бы отдать его другому пользователю.
+    """
+
+    def wrapper(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @wraps(func)
+        async def inner(*args, **kwargs):
+            response: Response = kwargs.pop("private_response")
+            response.headers["Cache-Control"] = "private, no-store"
+            redis = redis_manager.redis
+            if redis is None:
+                return await func(*args, **kwargs)
+
+            key = key_builder(func, f"{CACHE_PREFIX}:private", kwargs=kwargs)
+            cached = await redis.get(key)
+            if cached is not None:
+                return coder.decode(cached)
+
+            result = await func(*args, **kwargs)
+            await redis.set(key, coder.encode(result), ex=expire)
+            return result
+
+        # FastAPI передаст Response в обертку, сама функция его не принимает
+        inner.__signature__ = signature.replace(
+            parameters=[
+                *signature.parameters.values(),
+                inspect.Parameter(
+                    "private_response", inspect.Parameter.KEYWORD_ONLY, annotation=Response
+                ),
+            ]
+        )
+        return inner
+
+    return wrapper
@@ -1,34 +1,71 @@
 # ruff: noqa: E402
+import asyncio
 import json
+import os
+import sys
 from typing import AsyncGenerator, Any
 from unittest import mock
 
-from src.schemas.facilities import FacilityAdd
+# pytest -n auto: каждый воркер xdist работает в своей базе <DB_NAME>_gw0, <DB_NAME>_gw1, ...
+# Имя подменяется до импорта src, пока settings и движки еще не созданы
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+if XDIST_WORKER:
+    os.environ["DB_NAME"] = f"{os.environ['DB_NAME']}_{XDIST_WORKER}"
 
 mock.patch("fastapi_cache.decorator.cache", lambda *args, **kwargs: lambda f: f).start()
 
+import httpx
+import orjson
 import pytest
-from httpx import AsyncClient
+from httpx import AsyncClient, ASGITransport
+
+# Ответы API всегда в UTF-8: в тестах разбираем их orjson вместо stdlib json
+mock.patch.object(httpx.Response, "json", lambda self, **kwargs: orjson.loads(self.content)).start()
+from sqlalchemy import insert, text, NullPool
+from sqlalchemy.ext.asyncio import AsyncConnection, async_sessionmaker, create_async_engine
 
 from src.api.dependencies import get_db
 from src.config import settings
 from src.database import engine_null_pool, Base, async_session_maker_null_pool
 from src.main import app
 from src.models import *  # noqa
-from src.schemas.hotels import HotelAdd
-from src.schemas.rooms import RoomAdd
+from src.models import HotelsModel, RoomsModel, FacilitiesModel
 from src.utils.db_manager import DBManager
 
 
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Тесты крутятся на uvloop, как и приложение в main.py (на Windows uvloop нет)"""
+    if sys.platform == "win32":
+        return asyncio.DefaultEventLoopPolicy()
+
+    import uvloop
+
+    return uvloop.EventLoopPolicy()
+
+
 async def get_db_null_pool():
     async with DBManager(session_factory=async_session_maker_null_pool) as db:
         yield db
 
 
+@pytest.fixture(scope="session")
+async def db_connection(setup_database) -> AsyncGenerator[AsyncConnection, Any]:
+    async with engine_null_pool.connect() as conn:
+        yield conn
+
+
 @pytest.fixture(scope="function")
-async def db() -> AsyncGenerator[DBManager, Any]:
-    async for db in get_db_null_pool():
+async def db(db_connection: AsyncConnection) -> AsyncGenerator[DBManager, Any]:
+    """Тест работает во внешней транзакции, которая откатывается после него.
+    session_commit внутри теста лишь освобождает SAVEPOINT, в базе ничего не остается"""
+    transaction = await db_connection.begin()
+    session_factory = async_sessionmaker(
+        bind=db_connection, expire_on_commit=False, join_transaction_mode="create_savepoint"
+    )
+    async with DBManager(session_factory=session_factory) as db:
         yield db
+    await transaction.rollback()
 
 
 app.dependency_overrides[get_db] = get_db_null_pool
@@ -36,40 +73,63 @@ app.dependency_overrides[get_db] = get_db_null_pool
 
 @pytest.fixture(scope="session")
 async def ac() -> AsyncGenerator[AsyncClient, Any]:
-    async with AsyncClient(app=app, base_url="http://test") as ac:
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
         yield ac
 
 
 @pytest.fixture(scope="session", autouse=True)
 def check_test_mode():
     assert settings.MODE == "TEST"
+    # кэш подготовленных выражений (statement_cache_size в src/database.py) есть только у asyncpg
+    assert engine_null_pool.dialect.driver == "asyncpg"
+
+
+async def create_worker_database() -> None:
+    """Создает базу воркера через служебную базу postgres, если ее еще нет"""
+    maintenance_url = engine_null_pool.url.set(database="postgres")
+    maintenance_engine = create_async_engine(
+        maintenance_url, poolclass=NullPool, isolation_level="AUTOCOMMIT"
+    )
+    try:
+        async with maintenance_engine.connect() as conn:
+            exists = await conn.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": settings.DB_NAME},
+            )
+            if not exists:
+                await conn.execute(text(f'CREATE DATABASE "{settings.DB_NAME}"'))
+    finally:
+        await maintenance_engine.dispose()
 
 
 @pytest.fixture(scope="session", autouse=True)
 async def setup_database(check_test_mode):
+    if XDIST_WORKER:
+        await create_worker_database()
+
     async with engine_null_pool.begin() as conn:
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
 
 
-@pytest.fixture(scope="session", autouse=True)
-async def add_data_in_database(setup_database):
-    with open("tests/mock_hotels.json", "r") as file_hotels:
-        hotels_data = json.load(file_hotels)
-    with open("tests/mock_rooms.json", "r") as file_rooms:
-        rooms_data = json.load(file_rooms)
-    with open("tests/mock_facilities.json", "r") as file_facilities:
-        facilities_data = json.load(file_facilities)
+@pytest.fixture(scope="session")
+def seed_data() -> dict[str, list[dict]]:
+    """Моковые данные читаются один раз за сессию"""
+    seed = {}
+    for name in ("hotels", "rooms", "facilities"):
+        with open(f"tests/mock_{name}.json", "r") as file:
+            seed[name] = json.load(file)
+    return seed
 
-    hotels = [HotelAdd.model_validate(hotel) for hotel in hotels_data]
-    rooms = [RoomAdd.model_validate(room) for room in rooms_data]
-    facilities = [FacilityAdd.model_validate(facility) for facility in facilities_data]
 
-    async with DBManager(session_factory=async_session_maker_null_pool) as db_:
-        await db_.hotels.add_bulk(hotels)
-        await db_.rooms.add_bulk(rooms)
-        await db_.facilities.add_bulk(facilities)
-        await db_.session_commit()
+@pytest.fixture(scope="session", autouse=True)
+async def add_data_in_database(setup_database, seed_data):
+    # Моковые данные заливаются Core-INSERT'ами (executemany) в одной транзакции,
+    # без pydantic-валидации и сессии ORM
+    async with engine_null_pool.begin() as conn:
+        await conn.execute(insert(HotelsModel), seed_data["hotels"])
+        await conn.execute(insert(RoomsModel), seed_data["rooms"])
+        await conn.execute(insert(FacilitiesModel), seed_data["facilities"])
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -101,10 +161,10 @@ async def authenticated_ac(register_user, ac: AsyncClient):
 
 
 @pytest.fixture
-async def original_hotel_data(ac, hotel_id):
-    """Получает исходные данные отеля перед тестом"""
-    if hotel_id in [1, 2, 3]:  # Только для существующих отелей
-        response = await ac.get(f"/hotels/{hotel_id}")
-        if response.status_code == 200:
-            return response.json()
+def original_hotel_data(hotel_id, seed_data):
+    """Исходные данные отеля берутся из сида без запроса к API:
+    таблицы создаются заново, поэтому id отелей совпадают с порядком в mock_hotels.json"""
+    hotels = seed_data["hotels"]
+    if 1 <= hotel_id <= len(hotels):
+        return {"id": hotel_id, **hotels[hotel_id - 1]}
     return None
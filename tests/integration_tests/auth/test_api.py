@@ -38,6 +38,7 @@ async def test_auth_flow(email, password, first_name, last_name, username, statu
     )
     user = response_me.json()
     assert response_me.status_code == 200
+    assert response_me.headers["cache-control"] == "private, no-store"
     assert user["email"] == email
     assert user["first_name"] == first_name
     assert user["last_name"] == last_name
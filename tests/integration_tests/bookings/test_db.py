@@ -1,5 +1,9 @@
 from datetime import date
 
+import pytest
+
+from src.config import settings
+from src.repositories.utils import rooms_ids_for_booking
 from src.schemas.bookings import BookingAdd
 
 
@@ -43,3 +47,38 @@ async def test_booking_crud(db):
     assert not await db.bookings.get_one_or_none(id=new_booking.id)
 
     await db.session_commit()
+
+
+@pytest.mark.parametrize("use_room_day_bookings", [False, True])
+@pytest.mark.parametrize(
+    "date_from, date_to, is_free",
+    [
+        (date(2030, 1, 1), date(2030, 1, 9), True),
+        (date(2030, 1, 5), date(2030, 1, 10), False),
+        (date(2030, 1, 12), date(2030, 1, 13), False),
+        (date(2030, 1, 15), date(2030, 1, 20), False),
+        (date(2030, 1, 16), date(2030, 1, 20), True),
+    ],
+)
+async def test_rooms_ids_for_booking(
+    db, monkeypatch, use_room_day_bookings, date_from, date_to, is_free
+):
+    monkeypatch.setattr(settings, "USE_ROOM_DAY_BOOKINGS", use_room_day_bookings)
+    room = (await db.rooms.get_all())[0]
+    user_id = (await db.users.get_all())[0].id
+    # Занимаем все экземпляры номера, room_day_bookings заполняет триггер
+    for _ in range(room.quantity):
+        await db.bookings.add(
+            BookingAdd(
+                room_id=room.id,
+                user_id=user_id,
+                date_from=date(2030, 1, 10),
+                date_to=date(2030, 1, 15),
+                price=room.price,
+            )
+        )
+
+    free_rooms_ids = (
+        await db.session.scalars(rooms_ids_for_booking(date_from, date_to, room.hotel_id))
+    ).all()
+    assert (room.id in free_rooms_ids) is is_free
@@ -1,42 +1,52 @@
+import asyncio
+
 import pytest
 
 
-@pytest.mark.parametrize(
-    "date_from, date_to, status_code",
-    [
-        ("2024-08-01", "2024-08-10", 200),
-        ("2024-08-20", "2024-08-10", 422),
-        ("2024-08-01", "2025-09-10", 200),
-    ],
-)
-async def test_get_hotels(ac, date_from, date_to, status_code):
-    response = await ac.get(
-        "/hotels",
-        params={
-            "date_from": date_from,
-            "date_to": date_to,
-        },
+# Чтения не меняют данные: все случаи отправляются одновременно через asyncio.gather
+GET_HOTELS_CASES = [
+    # date_from, date_to, status_code
+    ("2024-08-01", "2024-08-10", 200),
+    ("2024-08-20", "2024-08-10", 422),
+    ("2024-08-01", "2025-09-10", 200),
+]
+
+
+async def test_get_hotels(ac):
+    responses = await asyncio.gather(
+        *(
+            ac.get("/hotels", params={"date_from": date_from, "date_to": date_to})
+            for date_from, date_to, _ in GET_HOTELS_CASES
+        )
     )
 
-    assert response.status_code == status_code
+    for case, response in zip(GET_HOTELS_CASES, responses):
+        assert response.status_code == case[-1], case
 
 
-@pytest.mark.parametrize(
-    "hotel_id, status_code",
-    [
-        (1, 200),
-        (2, 200),
-        (6, 404),
-    ],
-)
-async def test_get_hotel(ac, hotel_id, status_code):
-    response = await ac.get(f"/hotels/{hotel_id}", params={"hotel_id": hotel_id})
+GET_HOTEL_CASES = [
+    # hotel_id, status_code
+    (1, 200),
+    (2, 200),
+    (6, 404),
+]
 
-    assert response.status_code == status_code
-    hotel = response.json()
-    if status_code == 200:
-        assert hotel["title"]
-        assert hotel["location"]
+
+async def test_get_hotel(ac):
+    responses = await asyncio.gather(
+        *(
+            ac.get(f"/hotels/{hotel_id}", params={"hotel_id": hotel_id})
+            for hotel_id, _ in GET_HOTEL_CASES
+        )
+    )
+
+    for case, response in zip(GET_HOTEL_CASES, responses):
+        _, status_code = case
+        assert response.status_code == status_code, case
+        hotel = response.json()
+        if status_code == 200:
+            assert hotel["title"], case
+            assert hotel["location"], case
 
 
 @pytest.mark.parametrize(
@@ -67,30 +77,33 @@ async def test_create_hotel(ac, title, location, status_code):
         assert hotel["data"]["location"] == location
 
 
+def hotel_payload(title: str | None, location: str | None) -> dict:
+    """Тело PUT без пустых полей; собирается один раз при импорте модуля"""
+    return {key: value for key, value in (("title", title), ("location", location)) if value}
+
+
+EDIT_HOTEL_CASES = [
+    # hotel_id, title, location, status_code
+    (1, "test_title", "test_location", 204),
+    (2, None, "test_location", 422),
+    (3, "test_title", None, 422),
+    (10, "test_title", "test_location", 404),
+    (10, None, None, 422),
+]
+
+
 @pytest.mark.parametrize(
-    "hotel_id, title, location, status_code",
-    [
-        (1, "test_title", "test_location", 200),
-        (2, None, "test_location", 422),
-        (3, "test_title", None, 422),
-        (10, "test_title", "test_location", 404),
-        (10, None, None, 422),
-    ],
+    "hotel_id, title, location, status_code, json_data",
+    [(*case, hotel_payload(case[1], case[2])) for case in EDIT_HOTEL_CASES],
 )
-async def test_edit_hotel(ac, hotel_id, title, location, status_code):
-    json_data = {}
-    if title:
-        json_data["title"] = title
-    if location:
-        json_data["location"] = location
-
+async def test_edit_hotel(ac, hotel_id, title, location, status_code, json_data):
     response = await ac.put(f"/hotels/{hotel_id}", json=json_data)
 
     assert response.status_code == status_code
-    hotel = response.json()
-    if status_code == 200:
-        assert hotel["status"] == "OK"
+    if status_code == 204:
+        assert not response.content
     if status_code == 422:
+        hotel = response.json()
         if not title:
             assert "title" in hotel["detail"][0]["loc"]
             if not location:
@@ -102,9 +115,9 @@ async def test_edit_hotel(ac, hotel_id, title, location, status_code):
 @pytest.mark.parametrize(
     "hotel_id, update_data, status_code",
     [
-        (1, {"title": "test_title", "location": "test_location"}, 200),
-        (2, {"title": "test_title"}, 200),
-        (3, {"location": "test_location"}, 200),
+        (1, {"title": "test_title", "location": "test_location"}, 204),
+        (2, {"title": "test_title"}, 204),
+        (3, {"location": "test_location"}, 204),
         (10, {"title": "test_title", "location": "test_location"}, 404),
         (10, {}, 404),
         (3, {}, 400),
@@ -114,9 +127,7 @@ async def test_edit_hotel_partially(ac, hotel_id, update_data, status_code, orig
     response = await ac.patch(f"/hotels/{hotel_id}", json=update_data)
 
     assert response.status_code == status_code
-    hotel = response.json()
-    if status_code == 200:
-        assert hotel["status"] == "OK"
+    if status_code == 204:
         get_hotel = await ac.get(f"/hotels/{hotel_id}")
         assert get_hotel.status_code == 200
         json_get_hotel = get_hotel.json()
@@ -132,15 +143,9 @@ async def test_edit_hotel_partially(ac, hotel_id, update_data, status_code, orig
             assert json_get_hotel["location"] == original_hotel_data["location"]
 
 
-@pytest.mark.parametrize(
-    "hotel_id, status_code",
-    [
-        (4, 200),
-        (5, 200),
-        (5, 404),
-    ],
-)
-async def test_delete_hotels(ac, hotel_id, status_code):
-    response = await ac.delete(f"/hotels/{hotel_id}")
-
-    assert response.status_code == status_code
+async def test_delete_hotels(ac):
+    """Отели 4 и 5 созданы в test_create_hotel. Повторное удаление зависит от первого,
+    поэтому шаги идут последовательно в одном тесте, а не отдельными параметрами"""
+    for hotel_id, status_code in ((4, 204), (5, 204), (5, 404)):
+        response = await ac.delete(f"/hotels/{hotel_id}")
+        assert response.status_code == status_code, (hotel_id, status_code)
@@ -1,7 +1,33 @@
-from src.schemas.hotels import HotelAdd
+from src.schemas.hotels import HotelAdd, Hotel
 
 
 async def test_add_hotel(db):
     hotel_data = HotelAdd(title="Hotel 5 stars", location="Турция")
     await db.hotels.add(hotel_data)
     await db.session_commit()
+
+
+async def test_edit_bulk_hotels(db):
+    first = await db.hotels.add(HotelAdd(title="Первый", location="Казань"))
+    second = await db.hotels.add(HotelAdd(title="Второй", location="Уфа"))
+
+    await db.hotels.edit_bulk(
+        [
+            Hotel(id=first.id, title="Первый обновленный", location="Казань"),
+            Hotel(id=second.id, title="Второй обновленный", location="Пермь"),
+        ]
+    )
+
+    assert (await db.hotels.get_one(id=first.id)).title == "Первый обновленный"
+    second_hotel = await db.hotels.get_one(id=second.id)
+    assert second_hotel.title == "Второй обновленный"
+    assert second_hotel.location == "Пермь"
+
+
+async def test_request_cache_reset_on_rollback(db):
+    hotel = await db.hotels.add(HotelAdd(title="Откатный", location="Тверь"))
+    assert await db.hotels.get_one_or_none(id=hotel.id) is not None
+
+    # после отката закэшированная строка не должна возвращаться
+    await db.session.rollback()
+    assert await db.hotels.get_one_or_none(id=hotel.id) is None
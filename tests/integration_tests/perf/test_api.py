@@ -0,0 +1,33 @@
+import time
+
+import pytest
+
+# Бюджеты задержки горячих эндпоинтов; запуск: pytest -m perf
+pytestmark = pytest.mark.perf
+
+ROUNDS = 20
+
+
+async def mean_latency(send) -> float:
+    await send()  # прогрев: первые запросы компилируют SQL и заполняют кэши
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        response = await send()
+        assert response.status_code == 200
+    return (time.perf_counter() - started) / ROUNDS
+
+
+async def test_get_hotels_latency(ac):
+    mean = await mean_latency(
+        lambda: ac.get("/hotels", params={"date_from": "2024-08-01", "date_to": "2024-08-10"})
+    )
+    assert mean < 0.05
+
+
+async def test_get_rooms_latency(ac):
+    mean = await mean_latency(
+        lambda: ac.get(
+            "/hotels/1/rooms", params={"date_from": "2024-08-01", "date_to": "2024-08-10"}
+        )
+    )
+    assert mean < 0.05
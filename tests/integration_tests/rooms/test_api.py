@@ -1,60 +1,65 @@
+import asyncio
+
 import pytest
 from httpx import AsyncClient
 
 
-@pytest.mark.parametrize(
-    "hotel_id, date_from, date_to, status_code",
-    [
-        (1, "2024-08-01", "2024-08-10", 200),
-        (1, "2024-08-20", "2024-08-10", 422),
-        (2, "2024-08-01", "2025-09-10", 200),
-    ],
-)
-async def test_get_rooms(
-    ac: AsyncClient,
-    hotel_id: int,
-    date_from: str,
-    date_to: str,
-    status_code: int,
-    add_data_in_database,
-):
-    response = await ac.get(
-        f"/hotels/{hotel_id}/rooms",
-        params={
-            "date_from": date_from,
-            "date_to": date_to,
-        },
+# Чтения не меняют данные: все случаи отправляются одновременно через asyncio.gather
+GET_ROOMS_CASES = [
+    # hotel_id, date_from, date_to, status_code
+    (1, "2024-08-01", "2024-08-10", 200),
+    (1, "2024-08-20", "2024-08-10", 422),
+    (2, "2024-08-01", "2025-09-10", 200),
+]
+
+
+async def test_get_rooms(ac: AsyncClient, add_data_in_database):
+    responses = await asyncio.gather(
+        *(
+            ac.get(
+                f"/hotels/{hotel_id}/rooms",
+                params={"date_from": date_from, "date_to": date_to},
+            )
+            for hotel_id, date_from, date_to, _ in GET_ROOMS_CASES
+        )
     )
 
-    assert response.status_code == status_code
+    for case, response in zip(GET_ROOMS_CASES, responses):
+        assert response.status_code == case[-1], case
 
 
-@pytest.mark.parametrize(
-    "hotel_id, room_id, status_code, detail",
-    [
-        (1, 1, 200, None),
-        (1, 2, 200, None),
-        ("str", "str", 422, None),
-        (1, "str", 422, None),
-        ("str", 2, 422, None),
-        (2, 5, 404, "Номер не найден"),
-        (4, 2, 404, "Отель не найден"),
-    ],
-)
-async def test_get_room(
-    ac: AsyncClient, hotel_id: int, room_id: int, status_code: int, detail: str
-):
-    response = await ac.get(
-        f"/hotels/{hotel_id}/rooms/{room_id}", params={"hotel_id": hotel_id, "room_id": room_id}
+GET_ROOM_CASES = [
+    # hotel_id, room_id, status_code, detail
+    (1, 1, 200, None),
+    (1, 2, 200, None),
+    ("str", "str", 422, None),
+    (1, "str", 422, None),
+    ("str", 2, 422, None),
+    (2, 5, 404, "Номер не найден"),
+    (4, 2, 404, "Отель не найден"),
+]
+
+
+async def test_get_room(ac: AsyncClient):
+    responses = await asyncio.gather(
+        *(
+            ac.get(
+                f"/hotels/{hotel_id}/rooms/{room_id}",
+                params={"hotel_id": hotel_id, "room_id": room_id},
+            )
+            for hotel_id, room_id, _, _ in GET_ROOM_CASES
+        )
     )
 
-    assert response.status_code == status_code
-    room = response.json()
-    if status_code == 200:
-        assert room.get("hotel_id") == hotel_id
-        assert room.get("id") == room_id
-    elif status_code == 404:
-        assert room.get("detail") == detail
+    for case, response in zip(GET_ROOM_CASES, responses):
+        hotel_id, room_id, status_code, detail = case
+        assert response.status_code == status_code, case
+        room = response.json()
+        if status_code == 200:
+            assert room.get("hotel_id") == hotel_id, case
+            assert room.get("id") == room_id, case
+        elif status_code == 404:
+            assert room.get("detail") == detail, case
 
 
 @pytest.mark.parametrize(
@@ -97,3 +102,35 @@ async def test_create_room(
         for facility in hotel["data"]["facilities"]:
             assert facility["id"] in facilities_ids
             assert facility["title"]
+
+
+@pytest.mark.parametrize(
+    "hotel_id, room_id, price, status_code",
+    [
+        (3, 4, 5000, 200),
+        (4, 4, 5000, 404),
+        (3, 100, 5000, 404),
+    ],
+)
+async def test_patch_room(
+    ac: AsyncClient, hotel_id: int, room_id: int, price: int, status_code: int
+):
+    response = await ac.patch(f"/hotels/{hotel_id}/rooms/{room_id}", json={"price": price})
+
+    assert response.status_code == status_code
+    if status_code == 200:
+        assert response.json()["new_data"]["price"] == price
+
+
+async def test_delete_room(ac: AsyncClient):
+    response = await ac.post(
+        "/hotels/3/rooms",
+        json={"title": "Номер на удаление", "price": 1000, "quantity": 1},
+    )
+    room_id = response.json()["data"]["id"]
+
+    response = await ac.delete(f"/hotels/3/rooms/{room_id}")
+    assert response.status_code == 204
+
+    response = await ac.get(f"/hotels/3/rooms/{room_id}")
+    assert response.status_code == 404
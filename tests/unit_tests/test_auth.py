@@ -7,3 +7,11 @@ def test_create_access_token():
 
     assert jwt_token
     assert isinstance(jwt_token, str)
+
+
+def test_decode_token():
+    jwt_token = AuthService.create_access_token({"user_id": 1})
+
+    assert AuthService.decode_token(jwt_token)["user_id"] == 1
+    # повторный вызов отдает payload из кэша
+    assert AuthService.decode_token(jwt_token)["user_id"] == 1
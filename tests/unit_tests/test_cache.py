@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from src.utils.cache import single_flight
+
+
+async def test_single_flight_coalesces_concurrent_calls():
+    calls = 0
+
+    @single_flight("item_id")
+    async def get_item(item_id: int):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": item_id}
+
+    results = await asyncio.gather(*(get_item(item_id=1) for _ in range(5)), get_item(item_id=2))
+
+    assert calls == 2
+    assert results[:5] == [{"id": 1}] * 5
+    assert results[5] == {"id": 2}
+
+
+async def test_single_flight_propagates_exception():
+    @single_flight("item_id")
+    async def get_item(item_id: int):
+        await asyncio.sleep(0.01)
+        raise ValueError
+
+    results = await asyncio.gather(*(get_item(item_id=1) for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, ValueError) for result in results)
+    with pytest.raises(ValueError):
+        await get_item(item_id=1)
+
+
+async def test_single_flight_waiters_survive_leader_cancellation():
+    calls = 0
+
+    @single_flight("item_id")
+    async def get_item(item_id: int):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"id": item_id}
+
+    leader = asyncio.create_task(get_item(item_id=1))
+    await asyncio.sleep(0)
+    waiters = [asyncio.create_task(get_item(item_id=1)) for _ in range(3)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    results = await asyncio.gather(*waiters)
+
+    assert leader.cancelled()
+    assert results == [{"id": 1}] * 3
+    # один из ожидающих повторил запрос за отмененного, остальные дождались его
+    assert calls == 2